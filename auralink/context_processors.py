@@ -1,26 +1,59 @@
-import os
-from pathlib import Path
+from functools import lru_cache
 from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
 
+HERO_CANDIDATES = ['hero.jpg', 'Hero.jpg', 'hero.png', 'hero.svg', 'Hero.png']
+LOGO_CANDIDATES = ['logo.png', 'Logo.png', 'logo.svg', 'Logo.svg']
+FAVICON_CANDIDATES = ['favicon.ico', 'favicon.png', 'favicon.svg']
 
-def _find_static_image(base_dir: Path, candidates):
-    for name in candidates:
-        p = base_dir / 'static' / 'images' / name
-        if p.exists():
-            return f"/static/images/{name}"
-    return None
 
+def _static_exists(path):
+    # source dirs during development, collected files (or a remote storage) after collectstatic
+    if finders.find(path):
+        return True
+    try:
+        return staticfiles_storage.exists(path)
+    except Exception:
+        return False
 
-def site_settings(request):
-    base_dir = Path(settings.BASE_DIR)
 
-    hero = _find_static_image(base_dir, ['hero.jpg', 'Hero.jpg', 'hero.png', 'hero.svg', 'Hero.png'])
-    logo = _find_static_image(base_dir, ['logo.png', 'Logo.png', 'logo.svg', 'Logo.svg'])
-    favicon = _find_static_image(base_dir, ['favicon.ico', 'favicon.png', 'favicon.svg'])
+def _find_static_image(candidates):
+    for name in candidates:
+        path = f'images/{name}'
+        if _static_exists(path):
+            return static(path)
+    return None
+
 
+@lru_cache(maxsize=None)
+def site_assets():
+    """Resolve branding assets once; the result is reused for every render."""
+    hero = _find_static_image(HERO_CANDIDATES)
+    logo = _find_static_image(LOGO_CANDIDATES)
+    favicon = _find_static_image(FAVICON_CANDIDATES)
     return {
         'SITE_NAME': getattr(settings, 'SITE_NAME', 'AuraLink'),
         'HERO_IMAGE_URL': hero or getattr(settings, 'HERO_IMAGE_URL', '/static/images/hero.jpg'),
         'LOGO_URL': logo or getattr(settings, 'LOGO_URL', '/static/images/logo.png'),
         'FAVICON_URL': favicon or getattr(settings, 'FAVICON_URL', '/static/images/favicon.svg'),
-    }
\ No newline at end of file
+    }
+
+
+def clear_site_assets():
+    """Forget the resolved assets, e.g. after replacing files under static/images."""
+    site_assets.cache_clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting in ('SITE_NAME', 'HERO_IMAGE_URL', 'LOGO_URL', 'FAVICON_URL',
+                   'STATIC_URL', 'STATICFILES_DIRS', 'STATICFILES_STORAGE', 'STORAGES'):
+        clear_site_assets()
+
+
+def site_settings(request):
+    return site_assets()
@@ -0,0 +1,76 @@
+"""Read-replica routing.
+
+Set DB_REPLICAS to send the read queries of safe (GET/HEAD) requests to
+one of the replica aliases built in settings. Everything else stays on
+`default`:
+
+* writes, and any read inside a transaction on `default`;
+* the rest of a request once it has written, plus the requests of the
+  next DATABASE_REPLICA_PIN_SECONDS (via a cookie), so a user reads their
+  own registration after the redirect even if the replicas lag;
+* unsafe requests, management commands and the shell, which tend to read
+  then write.
+
+Without replicas configured the router always answers `default`.
+"""
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'db_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_current = ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        aliases = replicas()
+        if (state is None or state.pinned or not aliases
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            # read-your-writes: the rest of this request reads the primary too
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # replicas get their schema through replication
+        return db not in replicas()
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(pinned=request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES)
+        token = _current.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        if state.wrote and replicas():
+            response.set_cookie(PIN_COOKIE, '1', max_age=getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5),
+                                httponly=True, samesite='Lax')
+        return response
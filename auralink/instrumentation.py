@@ -0,0 +1,167 @@
+"""Opt-in per-view performance instrumentation.
+
+Enable with PERF_INSTRUMENTATION=True. Every request records its latency,
+DB query count and time, and template render time into a bounded ring
+buffer per URL name, and requests that repeat the same SQL many times are
+flagged as likely N+1 patterns. Staff can read the aggregates as JSON at
+/_perf/. Samples live in process memory, so each worker reports its own.
+"""
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.http import JsonResponse
+from django.template.backends.django import Template as BackendTemplate
+
+_current = ContextVar('perf_request_stats', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.sql = Counter()
+
+
+class PerfStore:
+    """Per-URL-name ring buffers of request samples, safe to share between threads."""
+
+    def __init__(self, size=500):
+        self.size = size
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=self.size))
+        self.nplusone = defaultdict(lambda: deque(maxlen=20))
+
+    def record(self, name, latency, stats, repeated):
+        with self.lock:
+            self.samples[name].append((latency, stats.queries, stats.db_time, stats.template_time))
+            for sql, count in repeated:
+                self.nplusone[name].append({'sql': sql[:500], 'count': count})
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.nplusone.clear()
+
+    def report(self):
+        with self.lock:
+            snapshot = {name: list(rows) for name, rows in self.samples.items()}
+            flagged = {name: list(rows) for name, rows in self.nplusone.items()}
+        report = {}
+        for name, rows in snapshot.items():
+            latencies = sorted(r[0] for r in rows)
+            report[name] = {
+                'requests': len(rows),
+                'latency_ms': {
+                    'p50': percentile(latencies, 50),
+                    'p95': percentile(latencies, 95),
+                    'p99': percentile(latencies, 99),
+                },
+                'avg_queries': round(sum(r[1] for r in rows) / len(rows), 2),
+                'max_queries': max(r[1] for r in rows),
+                'avg_db_ms': round(sum(r[2] for r in rows) / len(rows), 2),
+                'avg_template_ms': round(sum(r[3] for r in rows) / len(rows), 2),
+                'nplusone': flagged.get(name, []),
+            }
+        return report
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return round(sorted_values[index], 2)
+
+
+def repeated_queries(sql_counts, threshold):
+    """SQL statements run at least `threshold` times in one request.
+
+    Statements arrive with placeholders instead of values, so identical
+    text means an identical query shape, e.g. a lookup inside a loop.
+    """
+    return [(sql, count) for sql, count in sql_counts.most_common() if count >= threshold]
+
+
+store = PerfStore(getattr(settings, 'PERF_SAMPLE_SIZE', 500))
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += (time.perf_counter() - start) * 1000
+        stats.queries += 1
+        stats.sql[sql] += 1
+
+
+_original_render = None
+_patch_lock = threading.Lock()
+
+
+def _timed_render(self, context=None, request=None):
+    stats = _current.get()
+    if stats is None:
+        return _original_render(self, context, request)
+    # only time the outermost render so nested render_to_string calls are not double counted
+    stats.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        stats.template_depth -= 1
+        if stats.template_depth == 0:
+            stats.template_time += (time.perf_counter() - start) * 1000
+
+
+def install_template_timing():
+    """Wrap the Django template backend's Template.render, once per process.
+
+    Django has no hook around rendering (template_rendered is only sent
+    under the test runner), so the method is replaced process-wide. The
+    wrapper only times renders inside an instrumented request; anywhere
+    else it costs one ContextVar lookup.
+    """
+    global _original_render
+    with _patch_lock:
+        if _original_render is None:
+            _original_render = BackendTemplate.render
+            BackendTemplate.render = _timed_render
+
+
+class PerfMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'PERF_NPLUSONE_THRESHOLD', 5)
+        install_template_timing()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(_db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        latency = (time.perf_counter() - start) * 1000
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match and match.view_name else '<unresolved>'
+        store.record(name, latency, stats, repeated_queries(stats.sql, self.threshold))
+        return response
+
+
+@staff_member_required
+def perf_report(request):
+    return JsonResponse(store.report())
@@ -25,6 +25,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # outside SessionMiddleware so session writes also pin the request to the primary
+    'auralink.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -33,6 +35,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-view latency/query instrumentation, reported as JSON at /_perf/ (staff only)
+PERF_INSTRUMENTATION = os.environ.get('PERF_INSTRUMENTATION', 'False') == 'True'
+PERF_SAMPLE_SIZE = int(os.environ.get('PERF_SAMPLE_SIZE', '500'))  # samples kept per URL name
+PERF_NPLUSONE_THRESHOLD = int(os.environ.get('PERF_NPLUSONE_THRESHOLD', '5'))  # identical queries per request
+if PERF_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'auralink.instrumentation.PerfMiddleware')
+
 ROOT_URLCONF = 'auralink.urls'
 
 TEMPLATES = [
@@ -59,6 +68,14 @@ HERO_IMAGE_URL = os.environ.get('HERO_IMAGE_URL', '/static/images/hero.svg')
 LOGO_URL = os.environ.get('LOGO_URL', '/static/images/logo.svg')
 FAVICON_URL = os.environ.get('FAVICON_URL', '/static/images/favicon.svg')
 
+# Public event listing: page size and how the total is shown
+# ('none', 'approximate' = COUNT(*) cached for a few minutes, 'exact' = COUNT(*) per request)
+EVENT_LIST_PAGE_SIZE = int(os.environ.get('EVENT_LIST_PAGE_SIZE', '6'))
+EVENT_LIST_COUNT = os.environ.get('EVENT_LIST_COUNT', 'approximate')
+REGISTRATION_TABLE_PAGE_SIZE = int(os.environ.get('REGISTRATION_TABLE_PAGE_SIZE', '50'))  # organizer event page
+# archive_registrations moves registrations of events older than this out of the hot table
+REGISTRATION_ARCHIVE_DAYS = int(os.environ.get('REGISTRATION_ARCHIVE_DAYS', '365'))
+
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
@@ -73,9 +90,64 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', ''),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', ''),
+        # keep connections open between requests instead of reconnecting every time
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),  # seconds; 0 closes after each request
+        # ping a reused connection before the first query of a request so a dropped one is replaced
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.mysql':
+    DATABASES['default']['OPTIONS'] = {
+        'charset': os.environ.get('DB_CHARSET', 'utf8mb4'),
+        # READ COMMITTED avoids stale snapshots in long requests; seat claims lock rows explicitly
+        'isolation_level': os.environ.get('DB_ISOLATION_LEVEL', 'read committed'),
+        'init_command': os.environ.get('DB_INIT_COMMAND', "SET sql_mode='STRICT_TRANS_TABLES'"),
+    }
+
+# Single-node SQLite deployments: WAL lets readers run alongside a writer (see auralink/sqlite.py)
+SQLITE_WAL = os.environ.get('SQLITE_WAL', 'False') == 'True'
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # file-backed test database (git-ignored) so the threaded tests in
+    # events/tests_registration.py get real sqlite locking instead of the
+    # in-memory database's shared-cache "table is locked" errors
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+    # seconds a connection waits for another writer's lock before "database is locked"
+    DATABASES['default']['OPTIONS'] = {'timeout': int(os.environ.get('SQLITE_TIMEOUT', '20'))}
+
+# Read replicas - comma separated hosts (or file names for sqlite) holding copies of
+# `default`; GET requests read from them, see auralink/db_router.py
+DATABASE_REPLICAS = []
+for i, location in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    replica = dict(DATABASES['default'])
+    replica['NAME' if replica['ENGINE'] == 'django.db.backends.sqlite3' else 'HOST'] = location.strip()
+    # tests run against the primary's test database
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica_{i}'] = replica
+    DATABASE_REPLICAS.append(f'replica_{i}')
+DATABASE_ROUTERS = ['auralink.db_router.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', '5'))  # primary reads after a write
+
+# Cache - local memory by default; point CACHE_BACKEND/CACHE_LOCATION at
+# django.core.cache.backends.redis.RedisCache or FileBasedCache to share it between workers
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'auralink'),
+    }
+}
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', '300'))  # seconds
+# Part of every page ETag: set it to a new value (e.g. the git commit) on each deploy so
+# browsers revalidate pages whose templates changed
+RELEASE = os.environ.get('RELEASE', '')
+
+# .ics calendar feeds: how far back they reach, how long clients and proxies may reuse
+# a response, and how long a generated feed body stays in the cache
+CALENDAR_FEED_PAST_DAYS = int(os.environ.get('CALENDAR_FEED_PAST_DAYS', '30'))
+CALENDAR_FEED_MAX_AGE = int(os.environ.get('CALENDAR_FEED_MAX_AGE', '300'))  # seconds
+CALENDAR_FEED_CACHE_TIMEOUT = int(os.environ.get('CALENDAR_FEED_CACHE_TIMEOUT', '3600'))  # seconds
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -103,6 +175,10 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Event image renditions generated by `manage.py process_images`
+EVENT_IMAGE_WIDTHS = (320, 640, 1280)
+EVENT_IMAGE_QUALITY = 80
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
@@ -111,6 +187,11 @@ CRISPY_TEMPLATE_PACK = 'bootstrap4'
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Aur aLink <no-reply@auralink.local>')
 
+# Outbound mail queue (drained by `manage.py send_queued_mail`)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.environ.get('EMAIL_OUTBOX_RETRY_DELAY', '60'))  # seconds, doubled per attempt
+EMAIL_OUTBOX_LEASE = int(os.environ.get('EMAIL_OUTBOX_LEASE', '300'))  # seconds a worker holds claimed messages
+
 # Stripe placeholders (set via .env in production)
 STRIPE_PUBLISHABLE_KEY = os.environ.get('STRIPE_PUBLISHABLE_KEY', '')
 STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY', '')
@@ -0,0 +1,16 @@
+"""SQLite connection tuning, enabled with SQLITE_WAL=True.
+
+WAL journaling lets page reads continue while a registration is being
+written, instead of every reader waiting on the writer's lock.
+synchronous=NORMAL is safe with WAL (a power loss can drop the last
+commits but never corrupts the file) and saves an fsync per commit.
+"""
+from django.conf import settings
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_WAL', False):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
@@ -8,5 +8,9 @@ urlpatterns = [
     path('', include('events.urls')),
 ]
 
+if settings.PERF_INSTRUMENTATION:
+    from .instrumentation import perf_report
+    urlpatterns.insert(0, path('_perf/', perf_report, name='perf_report'))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,10 +1,14 @@
 from django.contrib import admin
-from .models import Event, Registration, Category
+from django.utils import timezone
+from .models import Event, Registration, ArchivedRegistration, Category, OutboundEmail
+from .search import search
+from .exports import export_response
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug')
+    list_display = ('name', 'slug', 'registration_count')
+    readonly_fields = ('registration_count',)
     prepopulated_fields = {'slug': ('name',)}
 
 
@@ -20,11 +24,59 @@ class EventAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     list_filter = ('organizer', 'category')
     search_fields = ('title', 'venue')
+    readonly_fields = ('seats_taken',)
     inlines = [RegistrationInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # use the full-text index instead of LIKE '%term%' scans
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search(queryset, search_term)[0], False
+
 
 @admin.register(Registration)
 class RegistrationAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'email', 'event', 'created_at')
     list_filter = ('event',)
     search_fields = ('full_name', 'email', 'event__title')
+    actions = ['export_csv', 'export_ndjson']
+
+    @admin.action(description='Export selected registrations as CSV')
+    def export_csv(self, request, queryset):
+        return export_response(queryset, 'csv', 'registrations')
+
+    @admin.action(description='Export selected registrations as NDJSON')
+    def export_ndjson(self, request, queryset):
+        return export_response(queryset, 'ndjson', 'registrations')
+
+
+@admin.register(ArchivedRegistration)
+class ArchivedRegistrationAdmin(admin.ModelAdmin):
+    list_display = ('full_name', 'email', 'event', 'created_at', 'archived_at')
+    search_fields = ('email',)
+    list_select_related = ('event',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to', 'subject')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+    actions = ['requeue']
+
+    @admin.action(description='Requeue selected emails')
+    def requeue(self, request, queryset):
+        now = timezone.now()
+        # a SENDING row is leased to a live worker until next_attempt_at;
+        # requeueing it before then would send it twice
+        updated = (queryset.exclude(status=OutboundEmail.SENT)
+                   .exclude(status=OutboundEmail.SENDING, next_attempt_at__gt=now)
+                   .update(status=OutboundEmail.PENDING, attempts=0, next_attempt_at=now))
+        self.message_user(request, f'{updated} emails requeued.')
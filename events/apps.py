@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'events'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from auralink.sqlite import configure_connection
+        from . import signals  # noqa: F401
+        connection_created.connect(configure_connection, dispatch_uid='auralink.sqlite')
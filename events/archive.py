@@ -0,0 +1,45 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections, transaction
+from .models import ArchivedRegistration, Event, Registration, today_start
+
+FIELDS = ('id', 'event_id', 'full_name', 'email', 'phone', 'created_at')
+
+
+def archive_cutoff(days=None):
+    """Events starting before this are old enough to archive."""
+    if days is None:
+        days = getattr(settings, 'REGISTRATION_ARCHIVE_DAYS', 365)
+    return today_start() - timedelta(days=days)
+
+
+def archivable(cutoff):
+    # old events come off the start_time index; their rows off reg_event_created_idx
+    old_events = Event.objects.filter(start_time__lt=cutoff).values('pk')
+    return Registration.objects.filter(event__in=old_events)
+
+
+def archive_batch(cutoff, batch_size=1000):
+    """Move up to batch_size registrations of events older than cutoff; returns how many moved.
+
+    Copy and delete share one transaction, so a crash leaves each row in
+    exactly one table. The delete skips the Registration signals on
+    purpose: archived rows still count towards seats_taken and the
+    category rollups.
+    """
+    with transaction.atomic():
+        rows = list(archivable(cutoff).order_by().values_list(*FIELDS)[:batch_size])
+        if not rows:
+            return 0
+        ArchivedRegistration.objects.bulk_create(
+            [ArchivedRegistration(**dict(zip(FIELDS, row))) for row in rows], ignore_conflicts=True)
+        ids = [row[0] for row in rows]
+        # plain SQL rather than QuerySet.delete(): that would load every row
+        # and fire the post_delete receivers that release seats and
+        # decrement the category rollups, which archived rows keep
+        db = Registration.objects.db
+        with connections[db].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {connections[db].ops.quote_name(Registration._meta.db_table)} '
+                f'WHERE id IN ({", ".join(["%s"] * len(ids))})', ids)
+    return len(rows)
@@ -0,0 +1,190 @@
+"""Request benchmarks for the public and organizer flows, run by `manage.py benchmark`.
+
+Each scenario is one URL driven through Django's test client, so the full
+middleware and template stack runs without a web server in the way.
+Concurrent workers use their own client and database connection. Every
+request records its latency and the number of SQL queries it issued.
+"""
+import json
+import statistics
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from urllib.parse import urlencode
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from .models import Event, OutboundEmail, Registration
+from .pagination import paginate_keyset
+
+BUDGETS_FILE = Path(__file__).with_name('benchmark_budgets.json')
+EMAIL_DOMAIN = 'bench.example.com'
+
+
+class Scenario:
+    def __init__(self, name, url, user=None, post=None):
+        self.name = name
+        self.url = url
+        self.user = user
+        # callable(n) -> form data for the n-th request; GET when None
+        self.post = post
+
+    def request(self, client, n):
+        if self.post:
+            return client.post(self.url, self.post(n))
+        return client.get(self.url)
+
+
+class Result:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.queries = []
+        self.errors = 0
+        self.wall = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, latency, queries, status):
+        with self.lock:
+            self.latencies.append(latency)
+            self.queries.append(queries)
+            if status >= 400:
+                self.errors += 1
+
+    def summary(self):
+        ms = sorted(v * 1000 for v in self.latencies)
+        return {
+            'requests': len(ms),
+            'errors': self.errors,
+            'throughput': round(len(ms) / self.wall, 1) if self.wall else 0.0,
+            'p50_ms': round(percentile(ms, 50), 2),
+            'p95_ms': round(percentile(ms, 95), 2),
+            'p99_ms': round(percentile(ms, 99), 2),
+            'queries_mean': round(statistics.fmean(self.queries), 1) if self.queries else 0.0,
+            'queries_max': max(self.queries, default=0),
+        }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def _drive(scenario, numbers, result, close_connections):
+    client = Client()
+    if scenario.user:
+        client.force_login(scenario.user)
+    count = [0]
+
+    def counter(execute, sql, params, many, context):
+        count[0] += 1
+        return execute(sql, params, many, context)
+
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(counter))
+            for n in numbers:
+                count[0] = 0
+                started = time.perf_counter()
+                response = scenario.request(client, n)
+                result.add(time.perf_counter() - started, count[0], response.status_code)
+    finally:
+        if close_connections:
+            connections.close_all()
+
+
+def run_scenario(scenario, requests, concurrency=1, warmup=1):
+    """Send `requests` requests split over `concurrency` workers; returns a Result.
+
+    `warmup` requests go first and are not measured, so one-off work such
+    as filling a process-wide cache does not count against the budgets.
+    """
+    if warmup:
+        _drive(scenario, range(-warmup, 0), Result(scenario.name), close_connections=False)
+    result = Result(scenario.name)
+    started = time.perf_counter()
+    if concurrency <= 1:
+        # same thread and connection as the caller, so it also works inside a test transaction
+        _drive(scenario, range(requests), result, close_connections=False)
+    else:
+        workers = [threading.Thread(target=_drive, args=(scenario, range(i, requests, concurrency), result, True))
+                   for i in range(concurrency)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    result.wall = time.perf_counter() - started
+    return result
+
+
+def deep_list_url(pages):
+    """URL of event_list page `pages` + 1, walking the same cursors the view hands out."""
+    cursor = None
+    for _ in range(pages):
+        page = paginate_keyset(Event.objects.upcoming(), cursor, settings.EVENT_LIST_PAGE_SIZE)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    url = reverse('event_list')
+    return f'{url}?{urlencode({"cursor": cursor})}' if cursor else url
+
+
+def build_scenarios(organizer, prefix, deep_pages=20):
+    attendee, _ = User.objects.get_or_create(username='bench-attendee', defaults={'email': f'attendee@{EMAIL_DOMAIN}'})
+    event = Event.objects.upcoming().filter(slug__startswith=f'{prefix}-event-').order_by('start_time', 'id').first()
+    if event is None:
+        raise ValueError(f'No upcoming events with slug prefix {prefix!r}; seed the dataset first.')
+    now = event.start_time
+    # unlimited capacity so every checkout takes the full registration path
+    checkout_event, _ = Event.objects.get_or_create(slug=f'{prefix}-checkout', defaults={
+        'title': 'Benchmark checkout', 'description': 'Registrations made by manage.py benchmark.',
+        'start_time': now, 'end_time': now, 'venue': 'Benchmark Hall', 'price': 99, 'capacity': 0,
+    })
+    stamp = int(time.time() * 1000)
+
+    def checkout_form(n):
+        return {'full_name': f'Bench {n}', 'email': f'{stamp}-{n}@{EMAIL_DOMAIN}', 'phone': ''}
+
+    return [
+        Scenario('home', reverse('home')),
+        Scenario('event_list', reverse('event_list'), attendee),
+        Scenario('event_list_deep', deep_list_url(deep_pages), attendee),
+        Scenario('event_detail', reverse('event_detail', kwargs={'slug': event.slug}), attendee),
+        Scenario('checkout', reverse('checkout', kwargs={'slug': checkout_event.slug}), attendee, post=checkout_form),
+        Scenario('dashboard', reverse('dashboard'), organizer),
+    ]
+
+
+def cleanup():
+    """Remove the registrations and queued emails made by checkout runs."""
+    Registration.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+    OutboundEmail.objects.filter(to__endswith=f'@{EMAIL_DOMAIN}').delete()
+
+
+def load_budgets(path=BUDGETS_FILE):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_budgets(results, path=BUDGETS_FILE):
+    budgets = {r.name: r.summary()['queries_max'] for r in results}
+    Path(path).write_text(json.dumps(budgets, indent=2, sort_keys=True) + '\n')
+    return budgets
+
+
+def over_budget(results, budgets):
+    """(name, queries, budget) for every scenario whose worst request exceeded its budget."""
+    failures = []
+    for r in results:
+        budget = budgets.get(r.name)
+        worst = r.summary()['queries_max']
+        if budget is not None and worst > budget:
+            failures.append((r.name, worst, budget))
+    return failures
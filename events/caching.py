@@ -0,0 +1,98 @@
+"""Rendered HTML fragments for the hottest public pages.
+
+Keys embed version numbers kept in the cache itself: saving or deleting
+an Event bumps the featured version, changing a Category (or running a
+bulk job) bumps the content version, and per-event fragments also embed
+the event's updated_at. Stale entries are never read again and simply
+age out after FRAGMENT_CACHE_TIMEOUT.
+"""
+import threading
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+FEATURED_VERSION = 'fragment-version:featured'
+CONTENT_VERSION = 'fragment-version:content'
+
+_lock = threading.Lock()
+_stats = Counter()
+
+
+def fragment_stats():
+    """Hit/miss counters per fragment for this process."""
+    with _lock:
+        return dict(_stats)
+
+
+def reset_fragment_stats():
+    with _lock:
+        _stats.clear()
+
+
+def _count(name, outcome):
+    with _lock:
+        _stats[f'{name}.{outcome}'] += 1
+
+
+def _versions():
+    found = cache.get_many([FEATURED_VERSION, CONTENT_VERSION])
+    return found.get(FEATURED_VERSION, 0), found.get(CONTENT_VERSION, 0)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # not set yet (or evicted): any new value differs from the implicit 0
+        cache.set(key, 1, None)
+
+
+def content_version():
+    """Changes whenever cached content may be stale; see invalidate_all()."""
+    return cache.get(CONTENT_VERSION, 0)
+
+
+def invalidate_featured():
+    _bump(FEATURED_VERSION)
+
+
+def invalidate_all():
+    """Drop every fragment, e.g. after a bulk job that bypassed model signals."""
+    _bump(CONTENT_VERSION)
+
+
+def _cached(name, key, template, context):
+    html = cache.get(key)
+    if html is None:
+        _count(name, 'miss')
+        html = render_to_string(template, context)
+        cache.set(key, html, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 300))
+    else:
+        _count(name, 'hit')
+    return mark_safe(html)
+
+
+def viewer_role(user):
+    """The part of the viewer that changes the featured HTML (edit/delete buttons)."""
+    if not user.is_authenticated:
+        return 'anon'
+    if user.is_staff or user.is_superuser:
+        return 'staff'
+    # plain users only see buttons on events they organize
+    return f'user-{user.pk}'
+
+
+def featured_fragment(user, featured):
+    """HTML for the home page's featured events; `featured` is only evaluated on a miss."""
+    featured_version, content_version = _versions()
+    key = f'fragment:featured:{content_version}:{featured_version}:{viewer_role(user)}'
+    return _cached('featured', key, 'partials/featured_events.html', {'featured': featured, 'user': user})
+
+
+def event_body_fragment(event):
+    """HTML for the descriptive part of the event detail page."""
+    _, content_version = _versions()
+    key = f'fragment:event:{event.pk}:{event.updated_at.timestamp()}:{content_version}'
+    return _cached('event_detail', key, 'partials/event_body.html', {'event': event})
@@ -0,0 +1,92 @@
+"""Category navigation: every category's name, slug and upcoming event count.
+
+The list is built with two queries, stored in the cache under a
+versioned key and kept in this process next to the key it was built for.
+Checking the key is a cache read, so the listing dropdown and ?category=
+lookups run no SQL until it changes: signals bump the version once a
+Category or Event save or delete commits, bulk jobs bump it through
+caching.invalidate_all(), and the key embeds today's date so upcoming
+counts are recomputed once the day rolls over.
+
+With the default process-local cache a bump only reaches the worker that
+made the change, so the registry is never kept longer than
+FRAGMENT_CACHE_TIMEOUT, and a slug it does not know is looked up in the
+database before a caller gets None.
+"""
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from . import caching
+from .models import Category, Event, today_start
+
+REGISTRY_VERSION = 'category-registry:version'
+
+NavCategory = namedtuple('NavCategory', 'id name slug upcoming')
+
+# (key, categories ordered by name, {slug: category}, monotonic expiry)
+_loaded = (None, (), {}, 0)
+
+
+def _fresh_version():
+    # not a small counter: after the cache is cleared or evicts the version,
+    # it must not come back to a value a process still holds a registry for
+    version = time.time_ns()
+    cache.add(REGISTRY_VERSION, version, None)
+    return cache.get(REGISTRY_VERSION, version)
+
+
+def invalidate():
+    try:
+        cache.incr(REGISTRY_VERSION)
+    except ValueError:
+        _fresh_version()
+
+
+def _key():
+    versions = cache.get_many([REGISTRY_VERSION, caching.CONTENT_VERSION])
+    version = versions.get(REGISTRY_VERSION) or _fresh_version()
+    return (f'category-registry:{version}:'
+            f'{versions.get(caching.CONTENT_VERSION, 0)}:{today_start().date().isoformat()}')
+
+
+def _build():
+    upcoming = dict(Event.objects.upcoming().filter(category__isnull=False).order_by()
+                    .values('category').annotate(n=Count('id')).values_list('category', 'n'))
+    return tuple(NavCategory(pk, name, slug, upcoming.get(pk, 0))
+                 for pk, name, slug in Category.objects.order_by('name', 'id').values_list('id', 'name', 'slug'))
+
+
+def _timeout():
+    return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 300)
+
+
+def _registry():
+    global _loaded
+    key = _key()
+    loaded = _loaded
+    if loaded[0] == key and loaded[3] > time.monotonic():
+        return loaded
+    categories = cache.get(key)
+    if categories is None:
+        categories = _build()
+        cache.set(key, categories, _timeout())
+    # one tuple swap, so other threads see either the old or the new registry
+    _loaded = (key, categories, {c.slug: c for c in categories}, time.monotonic() + _timeout())
+    return _loaded
+
+
+def all_categories():
+    """Every category, ordered by name."""
+    return _registry()[1]
+
+
+def by_slug(slug):
+    """The category with this slug, or None."""
+    category = _registry()[2].get(slug)
+    if category is None and Category.objects.filter(slug=slug).exists():
+        # created through another worker whose version bump this process's cache never saw
+        invalidate()
+        category = _registry()[2].get(slug)
+    return category
@@ -0,0 +1,53 @@
+"""Conditional GET for the event pages.
+
+Views build an ETag from the rows they already fetched plus whatever
+else shows on the page, and a client or proxy holding a matching copy
+gets a 304 before any template is rendered. The HTML differs per viewer
+(navigation, edit/delete buttons, the CSRF token in forms), so the
+viewer goes into the ETag and responses are private, vary on Cookie and
+must be revalidated on every use.
+"""
+import hashlib
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from .caching import content_version
+
+
+def page_etag(request, *parts):
+    """ETag for a page showing `parts` (rows, counts, ...) to this viewer."""
+    user = request.user
+    viewer = (user.pk, user.is_staff, user.is_superuser) if user.is_authenticated else None
+    # forms embed a token derived from the CSRF secret; a client without the
+    # cookie gets a fresh secret here, so its ETag cannot match an older page
+    get_token(request)
+    # bulk jobs that bypass updated_at bump the content version
+    key = repr((settings.RELEASE, content_version(), viewer, request.META['CSRF_COOKIE'], parts))
+    return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+
+def _cacheable(request):
+    # flash messages are shown once
+    return request.method in ('GET', 'HEAD') and not len(get_messages(request))
+
+
+def conditional_page(request, etag, last_modified, render):
+    """render() the response unless the client's copy is current, then attach validators.
+
+    last_modified (a datetime or None) is sent along but only the ETag
+    decides a 304: seat counts and the viewer are not reflected in a
+    timestamp, so an If-Modified-Since alone could return a stale page.
+    """
+    if not _cacheable(request):
+        return render()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = render()
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ('Cookie',))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
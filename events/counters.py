@@ -0,0 +1,60 @@
+"""Denormalized registration counters.
+
+Event.seats_taken is the per-event count (kept by events.registrations)
+and Category.registration_count rolls it up per category. Both move with
+F() updates as registrations come and go; recount_events() and
+recount_categories() rebuild them in bulk (manage.py reconcile_counters).
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from .models import ArchivedRegistration, Category, Event, Registration
+
+
+def count_in_category(event_id, delta):
+    """Add delta to the registration count of event_id's category, if it has one."""
+    categories = Category.objects.filter(events=event_id)
+    if delta < 0:
+        categories = categories.filter(registration_count__gte=-delta)
+    categories.update(registration_count=F('registration_count') + delta)
+
+
+def uncount_event(event_id):
+    """Take a deleted event's seats out of its category total with one UPDATE."""
+    seats = Event.objects.filter(pk=event_id).values('seats_taken')
+    Category.objects.filter(events=event_id).update(
+        registration_count=Greatest(F('registration_count') - Subquery(seats), 0))
+
+
+def _count_per_event(model):
+    return Coalesce(Subquery(
+        model.objects.filter(event=OuterRef('pk'))
+        .order_by().values('event').annotate(n=Count('pk')).values('n')
+    ), 0)
+
+
+def _expected_seats():
+    # archived registrations of past events still count
+    return _count_per_event(Registration) + _count_per_event(ArchivedRegistration)
+
+
+def _expected_category_total():
+    return Coalesce(Subquery(
+        Event.objects.filter(category=OuterRef('pk'))
+        .order_by().values('category').annotate(n=Sum('seats_taken')).values('n')
+    ), 0)
+
+
+def recount_events(events=None):
+    """Recompute seats_taken for events (all by default); returns how many were wrong."""
+    events = Event.objects.all() if events is None else events
+    drifted = events.annotate(expected=_expected_seats()).exclude(seats_taken=F('expected'))
+    return Event.objects.filter(pk__in=list(drifted.values_list('pk', flat=True))).update(
+        seats_taken=_expected_seats())
+
+
+def recount_categories(categories=None):
+    """Recompute Category.registration_count from the event counters; returns how many were wrong."""
+    categories = Category.objects.all() if categories is None else categories
+    drifted = categories.annotate(expected=_expected_category_total()).exclude(registration_count=F('expected'))
+    return Category.objects.filter(pk__in=list(drifted.values_list('pk', flat=True))).update(
+        registration_count=_expected_category_total())
@@ -0,0 +1,64 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+COLUMNS = ['id', 'event', 'full_name', 'email', 'phone', 'registered_at']
+FIELDS = ('id', 'event__title', 'full_name', 'email', 'phone', 'created_at')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_rows(qs, chunk_size=2000):
+    """Yield registration tuples in primary-key chunks so memory stays flat.
+
+    Each chunk is its own small query; unlike .iterator(), this does not
+    depend on the backend supporting server-side cursors.
+    """
+    last_pk = 0
+    while True:
+        chunk = list(qs.filter(pk__gt=last_pk).order_by('pk').values_list(*FIELDS)[:chunk_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1][0]
+        yield from chunk
+
+
+class _Echo:
+    """File-like object whose write() hands back the line for streaming."""
+
+    def write(self, value):
+        return value
+
+
+# a leading character spreadsheets would read as the start of a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_safe(value):
+    """Quote text that Excel or Sheets would otherwise run as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow([csv_safe(value) for value in row])
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(COLUMNS, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def export_response(qs, fmt, filename):
+    """StreamingHttpResponse with qs's registrations as CSV or NDJSON."""
+    lines = csv_lines(iter_rows(qs)) if fmt == 'csv' else ndjson_lines(iter_rows(qs))
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
@@ -14,6 +14,10 @@ class RegistrationForm(forms.ModelForm):
             'phone': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Phone Number'}),
         }
 
+    def clean_email(self):
+        # stored lowercased, like imports, so the (event, email) constraint catches case variants
+        return self.cleaned_data['email'].lower()
+
 
 class SignUpForm(UserCreationForm):
     email = forms.EmailField(required=True, widget=forms.EmailInput(attrs={'class': 'form-control'}))
@@ -43,3 +47,10 @@ class EventForm(forms.ModelForm):
             'capacity': forms.NumberInput(attrs={'class': 'form-control'}),
             'category': forms.Select(attrs={'class': 'form-control'}),
         }
+
+
+class RegistrationImportForm(forms.Form):
+    file = forms.FileField(
+        help_text='CSV with a header row: full_name, email, phone (optional)',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control-file', 'accept': '.csv,text/csv'}),
+    )
@@ -0,0 +1,178 @@
+"""iCalendar (.ics) feeds of events for calendar apps to subscribe to.
+
+Calendar apps poll every few minutes, so a feed costs as little as
+possible when nothing changed:
+
+* the ETag comes from one aggregate over the feed's events (newest
+  updated_at and row count, so edits, additions and deletions all move
+  it), and a matching If-None-Match gets a 304;
+* the body is identical for every subscriber, so it is sent as
+  public and cacheable for CALENDAR_FEED_MAX_AGE seconds and a reverse
+  proxy can answer most polls without reaching Django;
+* a full body is kept in the cache under its ETag and the first request
+  after a change streams it from Event rows in (start_time, id) chunks
+  while filling that cache entry.
+
+Feeds cover events from CALENDAR_FEED_PAST_DAYS ago onwards. Like the
+event pages they are for signed-in users only; calendar apps cannot log
+in, so each user's feed URLs carry a ?token= signing their user id,
+which is checked without a query.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from .caching import content_version
+from .models import today_start
+from .pagination import keyset_after
+
+CONTENT_TYPE = 'text/calendar; charset=utf-8'
+FIELDS = ('id', 'slug', 'title', 'description', 'venue', 'start_time', 'end_time', 'updated_at', 'category__name')
+ORDERING = ('start_time', 'id')
+# memcached's default item limit is 1MB; bigger feeds are streamed every time
+MAX_CACHED_BYTES = 1000 * 1000
+FEED_TOKEN_SALT = 'events.ical.feed-token'
+
+
+def feed_token(user):
+    """The secret for user's feed URLs."""
+    return signing.Signer(salt=FEED_TOKEN_SALT).sign(str(user.pk))
+
+
+def feed_subscriber(request):
+    """The id of the user the request's ?token= was issued to, or None."""
+    try:
+        return int(signing.Signer(salt=FEED_TOKEN_SALT).unsign(request.GET.get('token', '')))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def feed_events(qs):
+    """The events of qs a feed includes: from CALENDAR_FEED_PAST_DAYS ago onwards."""
+    return qs.filter(start_time__gte=today_start() - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS))
+
+
+def iter_events(qs, chunk_size=500):
+    """Yield event value tuples by start_time in keyset chunks, so memory stays flat."""
+    qs = qs.order_by(*ORDERING).values_list(*FIELDS)
+    chunk = list(qs[:chunk_size])
+    while chunk:
+        yield from chunk
+        last = chunk[-1]
+        chunk = list(qs.filter(keyset_after(ORDERING, (last[5], last[0])))[:chunk_size])
+
+
+def escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+
+def fold(line):
+    """Split a content line into 75-octet pieces joined by CRLF + space (RFC 5545 3.1)."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + '\r\n'
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # never split a UTF-8 sequence
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode())
+        start, limit = end, 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def vevent(row, host, url):
+    pk, slug, title, description, venue, start, end, updated, category = row
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{pk}@{host}',
+        f'DTSTAMP:{_utc(updated)}',
+        f'LAST-MODIFIED:{_utc(updated)}',
+        f'DTSTART:{_utc(start)}',
+        f'DTEND:{_utc(max(start, end))}',
+        f'SUMMARY:{escape(title)}',
+        f'LOCATION:{escape(venue)}',
+        f'DESCRIPTION:{escape(description)}',
+        f'URL:{url}',
+    ]
+    if category:
+        lines.append(f'CATEGORIES:{escape(category)}')
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+
+def calendar_lines(rows, name, host, url_for):
+    yield ''.join(fold(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:-//{host}//AuraLink events//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape(name)}',
+        # ask clients not to poll more often than the feed can change
+        f'REFRESH-INTERVAL;VALUE=DURATION:PT{settings.CALENDAR_FEED_MAX_AGE}S',
+        f'X-PUBLISHED-TTL:PT{settings.CALENDAR_FEED_MAX_AGE}S',
+    ))
+    for row in rows:
+        yield vevent(row, host, url_for(row[1]))
+    yield 'END:VCALENDAR\r\n'
+
+
+def _filling_cache(chunks, key):
+    """Pass chunks through and cache their concatenation once complete."""
+    parts, size = [], 0
+    for chunk in chunks:
+        data = chunk.encode()
+        if parts is not None:
+            size += len(data)
+            if size > MAX_CACHED_BYTES:
+                parts = None
+            else:
+                parts.append(data)
+        yield data
+    if parts is not None:
+        cache.set(key, b''.join(parts), settings.CALENDAR_FEED_CACHE_TIMEOUT)
+
+
+def feed_response(request, qs, name, filename):
+    """The .ics feed of qs's events, or a 304 when the client's copy is current."""
+    qs = feed_events(qs)
+    state = qs.order_by().aggregate(last=Max('updated_at'), n=Count('id'))
+    host = request.get_host()
+    key = repr((settings.RELEASE, content_version(), request.is_secure(), host, name,
+                state['last'], state['n'], today_start().date()))
+    etag = quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        cache_key = f'ical:{etag}'
+        body = cache.get(cache_key)
+        if body is not None:
+            response = HttpResponse(body, content_type=CONTENT_TYPE)
+        else:
+            base = request.build_absolute_uri('/')[:-1]
+
+            def url_for(slug):
+                return base + reverse('event_detail', kwargs={'slug': slug})
+
+            lines = calendar_lines(iter_events(qs), name, host, url_for)
+            response = StreamingHttpResponse(_filling_cache(lines, cache_key), content_type=CONTENT_TYPE)
+        response['Content-Disposition'] = f'inline; filename="{filename}.ics"'
+    response['ETag'] = etag
+    # informational only; a timestamp cannot see deletions, so the ETag decides 304s
+    if state['last'] is not None:
+        response['Last-Modified'] = http_date(state['last'].timestamp())
+    patch_cache_control(response, public=True, max_age=settings.CALENDAR_FEED_MAX_AGE)
+    return response
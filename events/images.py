@@ -0,0 +1,99 @@
+import logging
+import os
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+# (key in Event.image_renditions, Pillow format, file extension)
+FORMATS = [
+    ('webp', 'WEBP', 'webp'),
+    ('jpeg', 'JPEG', 'jpg'),
+]
+
+
+def rendition_widths():
+    return sorted(getattr(settings, 'EVENT_IMAGE_WIDTHS', (320, 640, 1280)))
+
+
+def events_with_images():
+    return Event.objects.exclude(image='').exclude(image__isnull=True)
+
+
+def pending_events():
+    """Events whose image has no renditions yet (new uploads and existing images alike)."""
+    return events_with_images().filter(image_renditions={})
+
+
+def _encode(img, fmt):
+    buf = BytesIO()
+    quality = getattr(settings, 'EVENT_IMAGE_QUALITY', 80)
+    # no exif/icc arguments: the re-encoded file carries no metadata
+    if fmt == 'JPEG':
+        img.save(buf, fmt, quality=quality, optimize=True, progressive=True)
+    else:
+        img.save(buf, fmt, quality=quality, method=4)
+    return buf.getvalue()
+
+
+def delete_renditions(event):
+    storage = event.image.storage
+    for fmt, _, _ in FORMATS:
+        for _, name in event.image_renditions.get(fmt, []):
+            storage.delete(name)
+
+
+def generate_renditions(event):
+    """Resize event.image into every configured width and format, and save the result on the event.
+
+    Widths larger than the original are skipped (the original width is used
+    instead), so small uploads are never upscaled.
+    """
+    storage = event.image.storage
+    with event.image.open('rb') as fh:
+        source = Image.open(fh)
+        # honour the camera's rotation before the EXIF that carries it is dropped
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ('RGB', 'RGBA'):
+            source = source.convert('RGBA' if 'transparency' in source.info else 'RGB')
+        source.load()
+
+    widths = {w for w in rendition_widths() if w < source.width}
+    widths.add(min(source.width, rendition_widths()[-1]))
+    base, _ = os.path.splitext(os.path.basename(event.image.name))
+
+    delete_renditions(event)
+    renditions = {}
+    for key, fmt, ext in FORMATS:
+        img = source if fmt != 'JPEG' or source.mode == 'RGB' else source.convert('RGB')
+        entries = []
+        for width in sorted(widths):
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.LANCZOS) if width != img.width else img
+            name = storage.save(f'events/renditions/{base}-{width}.{ext}', ContentFile(_encode(resized, fmt)))
+            entries.append([width, name])
+        renditions[key] = entries
+
+    event.image_renditions = renditions
+    # bump updated_at so cached event fragments pick up the new markup
+    Event.objects.filter(pk=event.pk).update(image_renditions=renditions, updated_at=timezone.now())
+    return renditions
+
+
+def process_events(events):
+    """Generate renditions for each event; returns (processed, failed)."""
+    processed = failed = 0
+    for event in events:
+        try:
+            generate_renditions(event)
+            processed += 1
+        except Exception as exc:
+            # record the failure so a broken upload is not retried forever
+            logger.warning('Could not process image for event %s: %s', event.pk, exc)
+            Event.objects.filter(pk=event.pk).update(image_renditions={'error': str(exc)[:200]})
+            failed += 1
+    return processed, failed
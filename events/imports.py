@@ -0,0 +1,112 @@
+import csv
+from django.core.exceptions import ValidationError
+from django.core.validators import EmailValidator
+from django.db import IntegrityError, transaction
+from .models import Registration
+from .counters import count_in_category
+from .registrations import claim_seats, release_seats
+
+REQUIRED_COLUMNS = ('full_name', 'email')
+validate_email = EmailValidator()
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.rejected = []  # (line number, reason, raw row)
+
+    def reject(self, line, reason, row):
+        self.rejected.append((line, reason, row))
+
+
+def _valid_rows(reader, existing, result):
+    """Yield Registration-ready dicts, rejecting bad and duplicate rows as they stream past."""
+    seen = set(existing)
+    for line, row in enumerate(reader, start=2):
+        full_name = (row.get('full_name') or '').strip()
+        email = (row.get('email') or '').strip().lower()
+        phone = (row.get('phone') or '').strip()
+        if not full_name:
+            result.reject(line, 'missing full_name', row)
+            continue
+        try:
+            validate_email(email)
+        except ValidationError:
+            result.reject(line, 'invalid email', row)
+            continue
+        if email in seen:
+            result.reject(line, 'already registered', row)
+            continue
+        seen.add(email)
+        yield line, row, {'full_name': full_name[:255], 'email': email, 'phone': phone[:50]}
+
+
+def _insert(event, items):
+    """Insert items, returning the ones that were not already registered.
+
+    The existing emails were read before the import started, so a web
+    registration committed since then can still collide with the unique
+    (event, email) constraint. That chunk is then retried row by row.
+    """
+    try:
+        with transaction.atomic():
+            Registration.objects.bulk_create([Registration(event=event, **fields) for _, _, fields in items])
+        return items, []
+    except IntegrityError:
+        pass
+    inserted, duplicates = [], []
+    for item in items:
+        try:
+            with transaction.atomic():
+                # bulk_create, like the fast path: no post_save counting
+                Registration.objects.bulk_create([Registration(event=event, **item[2])])
+        except IntegrityError:
+            if not Registration.objects.filter(event=event, email=item[2]['email']).exists():
+                raise
+            duplicates.append(item)
+        else:
+            inserted.append(item)
+    return inserted, duplicates
+
+
+def import_registrations(event, lines, chunk_size=5000, dry_run=False):
+    """Load registrations for event from CSV text lines (header: full_name,email[,phone]).
+
+    Existing (event, email) pairs are fetched once up front, capacity is
+    claimed per chunk, and each chunk is inserted with one bulk_create in
+    its own transaction. Returns an ImportResult listing rejected rows.
+    """
+    result = ImportResult()
+    reader = csv.DictReader(lines)
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+
+    existing = {e.lower() for e in event.registrations.values_list('email', flat=True)}
+    rows = _valid_rows(reader, existing, result)
+    if dry_run:
+        event.refresh_from_db(fields=['capacity', 'seats_taken'])
+        remaining = max(event.capacity - event.seats_taken, 0) if event.capacity else None
+    while True:
+        chunk = [item for _, item in zip(range(chunk_size), rows)]
+        if not chunk:
+            break
+        if dry_run:
+            granted = len(chunk) if remaining is None else min(len(chunk), remaining)
+            if remaining is not None:
+                remaining -= granted
+            inserted, duplicates = chunk[:granted], []
+        else:
+            with transaction.atomic():
+                granted = claim_seats(event.pk, len(chunk))
+                inserted, duplicates = _insert(event, chunk[:granted])
+                if duplicates:
+                    release_seats(event.pk, len(duplicates))
+                # bulk_create skips the post_save handler that keeps the category rollup
+                count_in_category(event.pk, len(inserted))
+        result.created += len(inserted)
+        for line, row, _ in duplicates:
+            result.reject(line, 'already registered', row)
+        for line, row, _ in chunk[granted:]:
+            result.reject(line, 'event is full', row)
+    return result
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from events.archive import archivable, archive_batch, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Move registrations of long-past events into the archive table, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Archive events that started more than this many days ago '
+                                 '(default: REGISTRATION_ARCHIVE_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would move')
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options['days'])
+        if options['dry_run']:
+            count = archivable(cutoff).count()
+            self.stdout.write(f'{count} registrations of events before {cutoff:%Y-%m-%d} would be archived.')
+            return
+
+        total = 0
+        while True:
+            moved = archive_batch(cutoff, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            self.stdout.write(f'  {total} archived...')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {total} registrations of events before {cutoff:%Y-%m-%d}.'))
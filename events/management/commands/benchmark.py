@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from events import benchmark
+
+COLUMNS = ('requests', 'errors', 'throughput', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_mean', 'queries_max')
+
+
+def _cell(value):
+    return f'{value:>14.1f}' if isinstance(value, float) else f'{value:>14}'
+
+
+class Command(BaseCommand):
+    help = ('Seed a scaled dataset, then benchmark the public and organizer pages: latency percentiles, '
+            'throughput and queries per request, failing when a page exceeds its query budget. '
+            'Writes to the configured database; do not point it at production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=2000, help='Events to seed')
+        parser.add_argument('--registrations', type=int, default=20, help='Registrations per seeded event')
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--skip-seed', action='store_true', help='Reuse the dataset from an earlier run')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel clients per scenario')
+        parser.add_argument('--deep-pages', type=int, default=20, help='How far event_list_deep pages in')
+        parser.add_argument('--only', nargs='*', default=None, help='Run only these scenarios')
+        parser.add_argument('--budgets', default=str(benchmark.BUDGETS_FILE), help='JSON file of query budgets')
+        parser.add_argument('--update-budgets', action='store_true',
+                            help='Write the measured worst-case query counts as the new budgets')
+
+    def handle(self, *args, **options):
+        if not options['skip_seed']:
+            call_command('seed', scale=True, events=options['events'], registrations=options['registrations'],
+                         categories=options['categories'], seed=options['seed'], batch_size=5000,
+                         stdout=self.stdout)
+        organizer = User.objects.filter(username='organizer').first()
+        if organizer is None:
+            raise CommandError('No organizer user; run without --skip-seed first.')
+        try:
+            scenarios = benchmark.build_scenarios(organizer, f"load-{options['seed']}", options['deep_pages'])
+        except ValueError as exc:
+            raise CommandError(exc)
+        if options['only']:
+            scenarios = [s for s in scenarios if s.name in options['only']]
+
+        budgets = benchmark.load_budgets(options['budgets'])
+        results = []
+        self.stdout.write(f"{'scenario':<16}" + ''.join(f'{c:>14}' for c in COLUMNS) + f"{'budget':>10}")
+        try:
+            for scenario in scenarios:
+                result = benchmark.run_scenario(scenario, options['requests'], options['concurrency'])
+                results.append(result)
+                summary = result.summary()
+                self.stdout.write(f'{scenario.name:<16}' + ''.join(_cell(summary[c]) for c in COLUMNS)
+                                  + f"{budgets.get(scenario.name, '-'):>10}")
+        finally:
+            benchmark.cleanup()
+
+        if options['update_budgets']:
+            benchmark.save_budgets(results, options['budgets'])
+            self.stdout.write(self.style.SUCCESS(f"Query budgets written to {options['budgets']}."))
+            return
+        failures = benchmark.over_budget(results, budgets)
+        if failures:
+            raise CommandError('Query budget exceeded: ' + ', '.join(
+                f'{name} ran {queries} queries (budget {budget})' for name, queries, budget in failures))
+        self.stdout.write(self.style.SUCCESS('All scenarios within their query budgets.'))
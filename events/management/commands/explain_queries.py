@@ -0,0 +1,95 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from events.models import Event, Registration, OutboundEmail
+from events.archive import archivable
+from events.ical import FIELDS as FEED_FIELDS
+from events.pagination import keyset_after
+from events.search import search
+
+
+def hot_queries():
+    """(label, queryset, scan_allowed) for the queries behind each view.
+
+    Parameter values are placeholders: the plan depends on the shape of
+    the query, not on whether matching rows exist.
+    """
+    now = timezone.now()
+    found, ranking = search(Event.objects.upcoming(), 'jazz night')
+    return [
+        ('home: featured events', Event.objects.upcoming().order_by('start_time', 'id')[:6], False),
+        ('event_list: first page', Event.objects.upcoming().order_by('start_time', 'id')[:7], False),
+        ('event_list: past events', Event.objects.past().order_by('-start_time', '-id')[:7], False),
+        ('event_list: next page', Event.objects.filter(keyset_after(('start_time', 'id'), [now, 1])).order_by('start_time', 'id')[:7], False),
+        ('event_list: category page', Event.objects.filter(category_id=1).order_by('start_time', 'id')[:7], False),
+        ('event_list: upcoming in category', Event.objects.upcoming().filter(category_id=1).order_by('start_time', 'id')[:7], False),
+        ('event_list: search', found.order_by(*ranking)[:7], False),
+        ('event_detail: by slug', Event.objects.filter(slug='some-event'), False),
+        ('create_event: free slug suffix', Event.objects.filter(Q(slug='meetup') | Q(slug__gt='meetup-', slug__lt='meetup.')).values_list('slug', flat=True), False),
+        ('dashboard: organizer events', Event.objects.filter(organizer_id=1).select_related('category').order_by('-start_time'), False),
+        # superusers see every event, so reading the whole table is expected
+        ('dashboard: all events', Event.objects.select_related('category').order_by('-start_time'), True),
+        ('dashboard: organizer recent registrations', Registration.objects.filter(event__organizer_id=1).select_related('event').order_by('-created_at')[:10], False),
+        ('dashboard: all recent registrations', Registration.objects.select_related('event').order_by('-created_at')[:10], False),
+        ('organizer_event_detail: registrations by date', Registration.objects.filter(event_id=1).order_by('-created_at', '-id')[:51], False),
+        ('organizer_event_detail: registrations by name', Registration.objects.filter(event_id=1).order_by('full_name', 'id')[:51], False),
+        ('organizer_event_detail: registrations by email', Registration.objects.filter(event_id=1).order_by('email', 'id')[:51], False),
+        ('organizer_event_detail: signup histogram', Registration.objects.filter(event_id=1).order_by().annotate(day=TruncDate('created_at')).values('day').annotate(n=Count('id')), False),
+        ('calendar_feed: validator', Event.objects.filter(category_id=1, start_time__gte=now).order_by().values('category').annotate(last=Max('updated_at'), n=Count('id')), False),
+        ('calendar_feed: chunk', Event.objects.filter(category_id=1, start_time__gte=now).order_by('start_time', 'id').values_list(*FEED_FIELDS)[:500], False),
+        ('archive_registrations: batch', archivable(now).order_by()[:1000], False),
+        ('send_queued_mail: due messages', OutboundEmail.objects.filter(status__in=[OutboundEmail.PENDING, OutboundEmail.SENDING], next_attempt_at__lte=now).order_by('next_attempt_at', 'pk')[:100], False),
+    ]
+
+
+def explain(connection, qs):
+    """Return (plan lines, problems) for qs on the given connection."""
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            lines = [row[-1] for row in cursor.fetchall()]
+            # "SCAN table" without an index is a full table scan
+            problems = [line for line in lines
+                        if line.startswith('SCAN ') and ' INDEX ' not in line and 'CONSTANT ROW' not in line]
+        elif connection.vendor == 'mysql':
+            cursor.execute(f'EXPLAIN {sql}', params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            lines = [f"{r['table']}: type={r['type']} key={r['key']} rows={r['rows']} extra={r['Extra'] or ''}" for r in rows]
+            # access type ALL is a full table scan
+            problems = [line for line, r in zip(lines, rows) if r['type'] == 'ALL']
+        else:
+            raise CommandError(f'EXPLAIN audit does not support the {connection.vendor} backend')
+    return lines, problems
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the queries behind each view and report full table scans (SQLite and MySQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every query')
+        parser.add_argument('--fail-on-scan', action='store_true', help='Exit with an error if an unexpected full scan is found (for CI)')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        unexpected = 0
+        for label, qs, scan_allowed in hot_queries():
+            lines, problems = explain(connection, qs.using(options['database']))
+            if problems and not scan_allowed:
+                unexpected += 1
+                self.stdout.write(self.style.ERROR(f'FULL SCAN  {label}'))
+            elif problems:
+                self.stdout.write(self.style.WARNING(f'scan ok    {label}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'ok         {label}'))
+            if problems or options['verbose_plans']:
+                for line in lines:
+                    self.stdout.write(f'    {line}')
+
+        if unexpected and options['fail_on_scan']:
+            raise CommandError(f'{unexpected} queries do a full table scan')
+        self.stdout.write(f'{unexpected} unexpected full scans on {connection.vendor}.')
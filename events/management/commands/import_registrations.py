@@ -0,0 +1,41 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from events.imports import import_registrations
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Bulk import registrations for an event from a CSV file (columns: full_name, email, phone)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event', help='Event slug or id')
+        parser.add_argument('csv_path')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without inserting')
+        parser.add_argument('--rejects', help='Write rejected rows with the reason to this CSV file')
+
+    def handle(self, *args, **options):
+        lookup = {'pk': options['event']} if options['event'].isdigit() else {'slug': options['event']}
+        try:
+            event = Event.objects.get(**lookup)
+        except Event.DoesNotExist:
+            raise CommandError(f"Event {options['event']!r} not found")
+
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as fh:
+                result = import_registrations(event, fh, options['chunk_size'], options['dry_run'])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if options['rejects'] and result.rejected:
+            with open(options['rejects'], 'w', newline='', encoding='utf-8') as out:
+                writer = csv.writer(out)
+                writer.writerow(['line', 'reason', 'full_name', 'email', 'phone'])
+                for line, reason, row in result.rejected:
+                    writer.writerow([line, reason, row.get('full_name'), row.get('email'), row.get('phone')])
+        for line, reason, row in result.rejected[:20]:
+            self.stdout.write(self.style.WARNING(f"  line {line}: {reason} ({row.get('email')})"))
+
+        verb = 'Would import' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.created} registrations for {event.title}; {len(result.rejected)} rows rejected.'))
@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand
+from events.images import events_with_images, pending_events, process_events
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/JPEG renditions for event images (also backfills existing events)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--force', action='store_true', help='Regenerate renditions for every event with an image')
+        parser.add_argument('--loop', action='store_true', help='Keep watching for new uploads instead of exiting')
+        parser.add_argument('--interval', type=float, default=10.0, help='Seconds to sleep between polls with --loop')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['force']:
+            processed = failed = last_pk = 0
+            while True:
+                batch = list(events_with_images().filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                done, errors = process_events(batch)
+                processed += done
+                failed += errors
+            self.stdout.write(self.style.SUCCESS(f'Regenerated {processed} images, {failed} failed.'))
+            return
+
+        while True:
+            processed = failed = 0
+            while True:
+                batch = list(pending_events().order_by('pk')[:batch_size])
+                if not batch:
+                    break
+                done, errors = process_events(batch)
+                processed += done
+                failed += errors
+            if processed or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} images, {failed} failed.'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
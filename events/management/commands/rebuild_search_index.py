@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from events import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text event search index (needed after bulk loads that skip signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        count = search.rebuild(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {count} events.'))
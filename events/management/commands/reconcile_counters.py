@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from events import caching, counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized registration counters on events and categories'
+
+    def handle(self, *args, **options):
+        # events first: the category rollup is summed from the event counters
+        events = counters.recount_events()
+        categories = counters.recount_categories()
+        if events or categories:
+            caching.invalidate_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Corrected {events} event and {categories} category counters.'))
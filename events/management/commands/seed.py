@@ -1,16 +1,144 @@
+import random
+from itertools import islice
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from django.contrib.auth.models import User
 from datetime import timedelta
 from events.models import Event, Registration, Category
+from events import search, caching, counters
+
+ADJECTIVES = ['Annual', 'Spring', 'Global', 'Open', 'Late Night', 'Community', 'Regional', 'Summer', 'Winter', 'Grand']
+NOUNS = ['Hackathon', 'Jazz Night', 'Tech Summit', 'Art Walk', 'Startup Pitch', 'Yoga Retreat',
+         'Film Screening', 'Book Fair', 'Robotics Expo', 'Food Festival', 'Chess Open', 'Career Fair']
+VENUES = ['Main Campus Auditorium', 'Seminar Hall A', 'Seminar Hall B', 'Open Air Theatre',
+          'Sports Complex', 'Library Atrium', 'Innovation Lab', 'City Convention Centre']
+FIRST_NAMES = ['Aarav', 'Diya', 'Kabir', 'Meera', 'Rohan', 'Sara', 'Vihaan', 'Anaya', 'Ishaan', 'Zoya']
+LAST_NAMES = ['Patel', 'Shah', 'Mehta', 'Iyer', 'Khan', 'Desai', 'Joshi', 'Rao', 'Singh', 'Nair']
+
+
+def batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ScaleSeeder:
+    """Bulk generator for benchmark datasets.
+
+    Slugs and emails are derived from the row number and --seed, so the
+    same options always describe the same rows; a rerun only inserts the
+    events that are missing, together with their registrations.
+    """
+
+    def __init__(self, command, organizer, options):
+        self.command = command
+        self.organizer = organizer
+        self.options = options
+        self.batch_size = options['batch_size']
+        self.prefix = f"load-{options['seed']}"
+        self.rng = random.Random(options['seed'])
+        # anchor on midnight so reruns on the same day generate identical times
+        self.anchor = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def write(self, msg):
+        self.command.stdout.write(msg)
+
+    def run(self):
+        category_ids = self.create_categories()
+        created, registrations = self.create_events(category_ids)
+        # bulk_create skips the signals that maintain the search index, counters and page fragments
+        search.rebuild()
+        counters.recount_categories(Category.objects.filter(pk__in=category_ids))
+        caching.invalidate_all()
+        self.write(self.command.style.SUCCESS(
+            f'Created {created} events and {registrations} registrations '
+            f'({len(category_ids)} categories).'))
+
+    def create_categories(self):
+        wanted = {f'{self.prefix}-category-{i}': f'Load Category {i + 1}' for i in range(self.options['categories'])}
+        existing = set(Category.objects.filter(slug__in=wanted).values_list('slug', flat=True))
+        Category.objects.bulk_create(
+            [Category(name=name, slug=slug) for slug, name in wanted.items() if slug not in existing],
+            batch_size=self.batch_size)
+        slug_to_id = dict(Category.objects.filter(slug__in=wanted).values_list('slug', 'id'))
+        return [slug_to_id[slug] for slug in wanted]
+
+    def event_rows(self, category_ids):
+        # always draw from the RNG for every row so existing rows don't shift the sequence
+        rng = self.rng
+        for i in range(self.options['events']):
+            start = self.anchor + timedelta(days=rng.randint(-365, 365), hours=rng.randint(8, 20))
+            yield i, Event(
+                title=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i + 1}',
+                slug=f'{self.prefix}-event-{i}',
+                description='Generated for load testing.',
+                start_time=start,
+                end_time=start + timedelta(hours=rng.randint(1, 6)),
+                venue=rng.choice(VENUES),
+                price=rng.choice([0, 0, 0, 99, 199, 499]),
+                capacity=self.options['registrations'] + rng.randint(0, 50),
+                seats_taken=self.options['registrations'],
+                category_id=rng.choice(category_ids) if category_ids else None,
+                organizer=self.organizer,
+            )
+
+    def registrations_for(self, i, event_id):
+        rng = random.Random(f"{self.options['seed']}-{i}")
+        for j in range(self.options['registrations']):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield Registration(
+                event_id=event_id,
+                full_name=f'{first} {last}',
+                email=f'{first.lower()}.{last.lower()}.{j}.{i}@load.example.com',
+                phone=f'9{rng.randint(100000000, 999999999)}',
+            )
+
+    def create_events(self, category_ids):
+        existing = set(Event.objects.filter(slug__startswith=f'{self.prefix}-event-').values_list('slug', flat=True))
+        created = registrations = 0
+        for chunk in batched(self.event_rows(category_ids), self.batch_size):
+            new = [(i, ev) for i, ev in chunk if ev.slug not in existing]
+            if not new:
+                continue
+            with transaction.atomic():
+                Event.objects.bulk_create([ev for _, ev in new])
+                # not every backend returns primary keys from bulk inserts
+                ids = dict(Event.objects.filter(slug__in=[ev.slug for _, ev in new]).values_list('slug', 'id'))
+                regs = (reg for i, ev in new for reg in self.registrations_for(i, ids[ev.slug]))
+                for reg_batch in batched(regs, self.batch_size):
+                    Registration.objects.bulk_create(reg_batch)
+                    registrations += len(reg_batch)
+            created += len(new)
+            self.write(f'  {created} events, {registrations} registrations...')
+        return created, registrations
 
 
 class Command(BaseCommand):
     help = 'Seed the database with sample categories, events, an organizer and registrations'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', action='store_true',
+                            help='Generate a large synthetic dataset for load testing instead of the sample events')
+        parser.add_argument('--categories', type=int, default=40, help='Categories to generate with --scale')
+        parser.add_argument('--events', type=int, default=10000, help='Events to generate with --scale')
+        parser.add_argument('--registrations', type=int, default=100, help='Registrations per event with --scale')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=1, help='RNG seed; the same seed always produces the same data')
+
     def handle(self, *args, **options):
         self.stdout.write('Seeding database...')
+        organizer = self.get_organizer()
+        if options['scale']:
+            ScaleSeeder(self, organizer, options).run()
+            self.stdout.write(self.style.SUCCESS('Seeding complete.'))
+            return
+        self.seed_sample(organizer)
 
+    def get_organizer(self):
         # Create an organizer user
         organizer, created = User.objects.get_or_create(
             username='organizer',
@@ -29,7 +157,9 @@ class Command(BaseCommand):
                 organizer.is_staff = True
                 organizer.save()
             self.stdout.write(self.style.WARNING('Organizer user already exists (privileges ensured)'))
+        return organizer
 
+    def seed_sample(self, organizer):
         now = timezone.now()
 
         # Define categories
@@ -104,8 +234,7 @@ class Command(BaseCommand):
             if created:
                 self.stdout.write(self.style.SUCCESS(f'Created category: {cat_name}'))
 
-        # Create events per category with unique slug handling
-        from django.utils.text import slugify
+        # Create events per category
         offset = 3
         for cat_name, events in categories.items():
             for i, title in enumerate(events):
@@ -126,14 +255,7 @@ class Command(BaseCommand):
                     ev = Event.objects.get(title=title)
                     created = False
                 except Event.DoesNotExist:
-                    # create with a unique slug
-                    base_slug = slugify(title)[:200]
-                    slug = base_slug
-                    counter = 1
-                    while Event.objects.filter(slug=slug).exists():
-                        slug = f"{base_slug}-{counter}"
-                        counter += 1
-                    defaults['slug'] = slug
+                    # Event.save() picks a free slug
                     ev = Event.objects.create(title=title, **defaults)
                     created = True
 
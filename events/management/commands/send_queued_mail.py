@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from events.outbox import drain
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbound emails in batches over a single mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue instead of exiting once it is empty')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = drain(options['batch_size'])
+            except Exception as exc:
+                # typically the mail server refusing connections; messages stay queued
+                if not options['loop']:
+                    raise
+                self.stderr.write(f'Mail connection failed: {exc}')
+            else:
+                if sent or failed or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(f'Sent {sent} emails, {failed} failed.'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
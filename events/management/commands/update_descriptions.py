@@ -1,14 +1,52 @@
+from collections import Counter
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from events.models import Event
+from events import search, caching
 import random
+import re
+
+# Checked in this order: the first category with a keyword anywhere in the title wins
+KEYWORDS = [
+    ('music', ['music', 'concert', 'band', 'song', 'dj', 'fest']),
+    ('tech', ['tech', 'code', 'hack', 'ai', 'soft', 'web', 'data']),
+    ('art', ['art', 'design', 'paint', 'gallery', 'exhibit']),
+    ('business', ['business', 'startup', 'market', 'money', 'finance', 'lead']),
+    ('sports', ['sport', 'run', 'yoga', 'fit', 'game', 'match']),
+]
+PRIORITY = {name: rank for rank, (name, _) in enumerate(KEYWORDS)}
+# One pass over the title: the lookahead tries every start position, so
+# overlapping keywords from different categories are all seen.
+MATCHER = re.compile('(?=' + '|'.join(
+    f"(?P<{name}>{'|'.join(map(re.escape, words))})" for name, words in KEYWORDS) + ')')
+
+
+def classify(title):
+    """Keyword category for a title, or 'default' if none matches."""
+    best = None
+    for match in MATCHER.finditer(title.lower()):
+        name = match.lastgroup
+        if best is None or PRIORITY[name] < PRIORITY[best]:
+            best = name
+            if PRIORITY[best] == 0:
+                break
+    return best or 'default'
+
 
 class Command(BaseCommand):
     help = 'Updates event descriptions with varied, engaging text based on keywords.'
 
-    def handle(self, *args, **kwargs):
-        events = Event.objects.all()
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true', help='Classify events and report counts without writing')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        dry_run = options['dry_run']
+        total = Event.objects.count()
         count = 0
-        
+        tally = Counter()
+
         descriptions = {
             'music': (
                 "Get ready for an unforgettable night of music and rhythm! "
@@ -47,24 +85,34 @@ class Command(BaseCommand):
             ]
         }
 
-        for event in events:
-            title_lower = event.title.lower()
-            
-            if any(x in title_lower for x in ['music', 'concert', 'band', 'song', 'dj', 'fest']):
-                desc = descriptions['music']
-            elif any(x in title_lower for x in ['tech', 'code', 'hack', 'ai', 'soft', 'web', 'data']):
-                desc = descriptions['tech']
-            elif any(x in title_lower for x in ['art', 'design', 'paint', 'gallery', 'exhibit']):
-                desc = descriptions['art']
-            elif any(x in title_lower for x in ['business', 'startup', 'market', 'money', 'finance', 'lead']):
-                desc = descriptions['business']
-            elif any(x in title_lower for x in ['sport', 'run', 'yoga', 'fit', 'game', 'match']):
-                desc = descriptions['sports']
-            else:
-                desc = random.choice(descriptions['default'])
-            
-            event.description = desc
-            event.save()
-            count += 1
+        # Walk the table in primary-key chunks, loading only id and title, so
+        # memory stays bounded and rows being updated are never re-read.
+        last_pk = 0
+        while True:
+            chunk = list(Event.objects.filter(pk__gt=last_pk).order_by('pk').only('id', 'title')[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            for event in chunk:
+                kind = classify(event.title)
+                tally[kind] += 1
+                if kind == 'default':
+                    event.description = random.choice(descriptions['default'])
+                else:
+                    event.description = descriptions[kind]
+            if not dry_run:
+                # only the description column; updated_at is left alone
+                with transaction.atomic():
+                    Event.objects.bulk_update(chunk, ['description'])
+            count += len(chunk)
+            self.stdout.write(f'  {count}/{total} events processed')
 
-        self.stdout.write(self.style.SUCCESS(f'Successfully updated {count} event descriptions with varied text.'))
+        summary = ', '.join(f'{kind}: {n}' for kind, n in sorted(tally.items()))
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'Dry run: would update {count} event descriptions ({summary}).'))
+            return
+        if count:
+            # bulk_update skips the signals that keep the search index and page fragments current
+            search.rebuild()
+            caching.invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {count} event descriptions with varied text ({summary}).'))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_existing_seats(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Registration = apps.get_model('events', 'Registration')
+    counts = (Registration.objects.filter(event=OuterRef('pk'))
+              .order_by().values('event').annotate(n=Count('pk')).values('n'))
+    Event.objects.update(seats_taken=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_alter_category_slug_alter_event_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_seats, migrations.RunPython.noop),
+    ]
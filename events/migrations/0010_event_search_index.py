@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS events_event_fts "
+            "USING fts5(title, venue, description, tokenize='unicode61 remove_diacritics 2')")
+        schema_editor.execute(
+            "INSERT INTO events_event_fts (rowid, title, venue, description) "
+            "SELECT id, title, venue, description FROM events_event")
+    elif connection.vendor == 'mysql':
+        schema_editor.execute(
+            "ALTER TABLE events_event ADD FULLTEXT INDEX event_fulltext_idx (title, venue, description)")
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS events_event_fts")
+    elif connection.vendor == 'mysql':
+        schema_editor.execute("ALTER TABLE events_event DROP INDEX event_fulltext_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery, Window
+from django.db.models.functions import Coalesce, Lower, RowNumber
+
+CHUNK = 500
+
+
+def dedup_registrations(apps, schema_editor):
+    """Keep the earliest registration per (event, lowercased email), drop the rest."""
+    Event = apps.get_model('events', 'Event')
+    Registration = apps.get_model('events', 'Registration')
+    # one pass over the table: number the rows within each (event, email) group
+    duplicates = list(
+        Registration.objects.annotate(n=Window(
+            RowNumber(),
+            partition_by=[F('event_id'), Lower('email')],
+            order_by=F('id').asc(),
+        )).filter(n__gt=1).values_list('id', 'event_id')
+    )
+    for start in range(0, len(duplicates), CHUNK):
+        ids = [pk for pk, _ in duplicates[start:start + CHUNK]]
+        Registration.objects.filter(pk__in=ids).delete()
+
+    Registration.objects.exclude(email=Lower('email')).update(email=Lower('email'))
+
+    # historical models fire no signals, so recount seats where rows were removed
+    affected = {event_id for _, event_id in duplicates}
+    counts = (Registration.objects.filter(event=OuterRef('pk'))
+              .order_by().values('event').annotate(n=Count('pk')).values('n'))
+    Event.objects.filter(pk__in=affected).update(seats_taken=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_event_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedup_registrations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='registration',
+            constraint=models.UniqueConstraint(fields=('event', 'email'), name='reg_event_email_uniq'),
+        ),
+    ]
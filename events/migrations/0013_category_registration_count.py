@@ -0,0 +1,27 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_existing(apps, schema_editor):
+    Category = apps.get_model('events', 'Category')
+    Event = apps.get_model('events', 'Event')
+    totals = (Event.objects.filter(category=OuterRef('pk'))
+              .order_by().values('category').annotate(n=Sum('seats_taken')).values('n'))
+    Category.objects.update(registration_count=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_registration_unique_event_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='registration_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_archivedregistration'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['event', 'full_name'], name='reg_event_name_idx'),
+        ),
+    ]
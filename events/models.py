@@ -1,43 +1,147 @@
 from django.db import models
-from django.utils.text import slugify
+from django.utils import timezone
+from .slugs import save_with_slug
+
+
+def _without_counters(instance, kwargs, *counters):
+    """save() kwargs that leave denormalized counters out of an UPDATE.
+
+    Counters only move through F() updates; writing back the copy loaded
+    with the instance would undo registrations made since it was read.
+    """
+    if instance._state.adding or kwargs.get('update_fields') is not None or kwargs.get('force_insert'):
+        return kwargs
+    # only what was loaded: naming a deferred field would fetch it just to write it back
+    deferred = instance.get_deferred_fields()
+    fields = [f.attname for f in instance._meta.concrete_fields
+              if not f.primary_key and f.name not in counters and f.attname not in deferred]
+    return {**kwargs, 'update_fields': fields}
 
 
 class Category(models.Model):
     name = models.CharField(max_length=150)
     slug = models.SlugField(unique=True, blank=True, max_length=255)
     description = models.TextField(blank=True)
+    # Denormalized sum of seats_taken over the category's events, see events.counters
+    registration_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name_plural = 'categories'
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        kwargs = _without_counters(self, kwargs, 'registration_count')
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_slug(self, self.name, super().save, *args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
+def today_start():
+    """Midnight today in the site timezone: the line between upcoming and past events."""
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class EventQuerySet(models.QuerySet):
+    # both filters seek into the (start_time, id) index
+
+    def upcoming(self):
+        """Events starting today or later; today's events stay listed all day."""
+        return self.filter(start_time__gte=today_start())
+
+    def past(self):
+        return self.filter(start_time__lt=today_start())
+
+
 class Event(models.Model):
     title = models.CharField(max_length=255)
     slug = models.SlugField(unique=True, blank=True, max_length=255)
     description = models.TextField()
     image = models.ImageField(upload_to='events/', blank=True, null=True)
+    # {'webp': [[width, storage name], ...], 'jpeg': [...]}, filled in by `manage.py process_images`
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     venue = models.CharField(max_length=255)
     price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     capacity = models.PositiveIntegerField(default=0)
+    # Denormalized count of claimed seats, kept in step by events.registrations
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
     category = models.ForeignKey('Category', null=True, blank=True, on_delete=models.SET_NULL, related_name='events')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     organizer = models.ForeignKey('auth.User', null=True, blank=True, on_delete=models.SET_NULL, related_name='organized_events')
 
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the public listing, with and without a category filter
+            models.Index(fields=['start_time', 'id'], name='event_start_id_idx'),
+            models.Index(fields=['category', 'start_time', 'id'], name='event_cat_start_id_idx'),
+            # organizer dashboard: an organizer's events, newest first
+            models.Index(fields=['organizer', 'start_time'], name='event_org_start_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'image' in field_names:
+            # remember the stored image so save() can tell when it is replaced
+            instance._loaded_image = instance.image.name or ''
+        if 'category_id' in field_names:
+            # lets the post_save handler move registration counts between categories
+            instance._loaded_category_id = instance.category_id
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
+        # an instance loaded with .only()/.defer('image') cannot tell, so it keeps them
+        loaded_image = getattr(self, '_loaded_image', '' if self._state.adding else None)
+        if loaded_image is not None and (self.image.name or '') != loaded_image:
+            # new or replaced upload: renditions are regenerated off the request path
+            self.image_renditions = {}
+        kwargs = _without_counters(self, kwargs, 'seats_taken')
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_slug(self, self.title, super().save, *args, **kwargs)
+        if 'image' in self.__dict__:
+            self._loaded_image = self.image.name or ''
+        if 'category_id' in self.__dict__:
+            self._loaded_category_id = self.category_id
+
+    def image_srcset(self, fmt):
+        storage = self.image.storage
+        return ', '.join(f'{storage.url(name)} {width}w' for width, name in self.image_renditions.get(fmt, []))
+
+    @property
+    def webp_srcset(self):
+        return self.image_srcset('webp')
+
+    @property
+    def jpeg_srcset(self):
+        return self.image_srcset('jpeg')
+
+    @property
+    def image_fallback_url(self):
+        """Smallest JPEG rendition that still fills a card, or the original until renditions exist."""
+        jpegs = self.image_renditions.get('jpeg')
+        if jpegs:
+            return self.image.storage.url(jpegs[min(1, len(jpegs) - 1)][1])
+        return self.image.url if self.image else ''
+
+    @property
+    def seats_left(self):
+        """Remaining seats, or None when capacity is 0 (unlimited)."""
+        if not self.capacity:
+            return None
+        return max(self.capacity - self.seats_taken, 0)
+
+    @property
+    def is_sold_out(self):
+        return self.seats_left == 0
 
     def __str__(self):
         return self.title
@@ -50,5 +154,76 @@ class Registration(models.Model):
     phone = models.CharField(max_length=50, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # per-event registration lists and the organizer's recent registrations
+            models.Index(fields=['event', 'created_at'], name='reg_event_created_idx'),
+            # organizer registration table sorted by name (email sorts use the unique constraint)
+            models.Index(fields=['event', 'full_name'], name='reg_event_name_idx'),
+            # site-wide recent registrations on the superuser dashboard
+            models.Index(fields=['created_at'], name='reg_created_idx'),
+        ]
+        constraints = [
+            # one registration per email per event; retries hit this instead of a pre-check
+            models.UniqueConstraint(fields=['event', 'email'], name='reg_event_email_uniq'),
+        ]
+
     def __str__(self):
         return f"{self.full_name} - {self.event.title}"
+
+
+class ArchivedRegistration(models.Model):
+    """A registration for a long-past event, moved out of the hot table by archive_registrations.
+
+    Keeps the original primary key, so re-running an interrupted batch
+    cannot archive a row twice, and carries no secondary indexes besides
+    the event foreign key.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    event = models.ForeignKey(Event, related_name='archived_registrations', on_delete=models.CASCADE)
+    full_name = models.CharField(max_length=255)
+    email = models.EmailField()
+    phone = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.full_name} - {self.event_id} (archived)"
+
+
+class OutboundEmail(models.Model):
+    """A queued email, sent later by the send_queued_mail command."""
+    PENDING = 'pending'
+    # leased to a worker until next_attempt_at; due again if the worker dies
+    SENDING = 'sending'
+    SENT = 'sent'
+    DEAD = 'dead'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (DEAD, 'Dead'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.TextField(help_text='Comma separated recipient addresses')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    @property
+    def recipients(self):
+        return [addr for addr in self.to.split(',') if addr]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.status})"
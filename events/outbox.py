@@ -0,0 +1,107 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import OutboundEmail
+
+
+def enqueue(subject, message, recipient_list, from_email=None):
+    """Queue an email for the send_queued_mail worker instead of sending it inline."""
+    return OutboundEmail.objects.create(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=','.join(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base delay doubled for every failed attempt."""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_DELAY', 60)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def _due_messages(batch_size):
+    # pending messages, plus leased ones whose worker never reported back
+    qs = (OutboundEmail.objects
+          .filter(status__in=[OutboundEmail.PENDING, OutboundEmail.SENDING], next_attempt_at__lte=timezone.now())
+          .order_by('next_attempt_at', 'pk'))
+    # let several workers share the queue without sending the same row twice
+    if db_connection.features.has_select_for_update_skip_locked:
+        qs = qs.select_for_update(skip_locked=True)
+    else:
+        qs = qs.select_for_update()
+    return list(qs[:batch_size])
+
+
+def claim_batch(batch_size=100):
+    """Lease up to batch_size due messages to this worker.
+
+    The transaction only covers the claim, so no lock is held while mail
+    goes out. A worker that dies mid-batch leaves its messages in SENDING;
+    they become due again once the EMAIL_OUTBOX_LEASE expires, and messages
+    it already reported as sent are not sent twice.
+    """
+    lease_until = timezone.now() + timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_LEASE', 300))
+    with transaction.atomic():
+        messages = _due_messages(batch_size)
+        OutboundEmail.objects.filter(pk__in=[msg.pk for msg in messages]).update(
+            status=OutboundEmail.SENDING, attempts=F('attempts') + 1, next_attempt_at=lease_until)
+    for msg in messages:
+        msg.status = OutboundEmail.SENDING
+        msg.attempts += 1
+        msg.next_attempt_at = lease_until
+    return messages
+
+
+def send_batch(mail_connection, batch_size=100):
+    """Claim one batch of due messages and send them over an already open mail connection.
+
+    Each outcome is saved as soon as its send returns. Failed messages are
+    rescheduled with backoff, and dead-lettered once they reach
+    EMAIL_OUTBOX_MAX_ATTEMPTS. Returns (sent, failed).
+    """
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    sent = failed = 0
+    for msg in claim_batch(batch_size):
+        email = EmailMessage(msg.subject, msg.body, msg.from_email, msg.recipients,
+                             connection=mail_connection)
+        try:
+            email.send()
+        except Exception as exc:
+            failed += 1
+            # drop a possibly broken connection and reopen it once for the
+            # rest of the batch; if that fails too, each send opens its own
+            mail_connection.close()
+            try:
+                mail_connection.open()
+            except Exception:
+                pass
+            msg.last_error = f"{type(exc).__name__}: {exc}"
+            if msg.attempts >= max_attempts:
+                msg.status = OutboundEmail.DEAD
+            else:
+                msg.status = OutboundEmail.PENDING
+                msg.next_attempt_at = timezone.now() + retry_delay(msg.attempts)
+        else:
+            sent += 1
+            msg.status = OutboundEmail.SENT
+            msg.sent_at = timezone.now()
+            msg.last_error = ''
+        msg.save(update_fields=['status', 'next_attempt_at', 'last_error', 'sent_at'])
+    return sent, failed
+
+
+def drain(batch_size=100):
+    """Send every due message, batch by batch, over a single mail connection."""
+    total_sent = total_failed = 0
+    with get_connection() as mail_connection:
+        while True:
+            sent, failed = send_batch(mail_connection, batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                break
+    return total_sent, total_failed
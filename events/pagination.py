@@ -0,0 +1,137 @@
+import base64
+import datetime
+import hashlib
+import json
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder truncates to milliseconds, which would skip rows
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({'v': values, 'd': direction}, cls=_CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = data['v'], data['d']
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values, direction
+
+
+class KeysetPage:
+    """One page of keyset-paginated results plus opaque cursors to its neighbours."""
+
+    def __init__(self, items, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_after(ordering, values, reverse=False):
+    """Q matching rows that sort strictly after `values` under `ordering`.
+
+    Builds the expanded lexicographic comparison
+    (a > x) OR (a = x AND b > y) OR ..., plus a redundant a >= x bound
+    so the database can seek into a composite index on the ordering
+    columns instead of scanning it from the start.
+    """
+    q = Q()
+    for i, field in enumerate(ordering):
+        desc = field.startswith('-')
+        name = field.lstrip('-')
+        op = 'lt' if desc != reverse else 'gt'
+        term = Q(**{f'{name}__{op}': values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            term &= Q(**{prev_field.lstrip('-'): prev_value})
+        q |= term
+    first = ordering[0]
+    op = 'lte' if first.startswith('-') != reverse else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{op}': values[0]}) & q
+
+
+def _key(obj, ordering):
+    return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+
+def _from_cursor(qs, name, value):
+    # annotations (e.g. a search rank) are plain JSON numbers/strings already
+    if name in qs.query.annotations:
+        return value
+    return qs.model._meta.get_field(name).to_python(value)
+
+
+def paginate_keyset(qs, cursor, per_page, ordering=('start_time', 'id')):
+    """Fetch one page of qs without OFFSET or COUNT.
+
+    `ordering` must end in a unique, non-null column (usually the pk) so
+    that every row has a distinct position. Raises InvalidCursor for a
+    cursor that was not produced by this function.
+    """
+    ordering = tuple(ordering)
+    direction = 'next'
+    if cursor:
+        raw, direction = decode_cursor(cursor)
+        if len(raw) != len(ordering):
+            raise InvalidCursor(cursor)
+        try:
+            values = [_from_cursor(qs, f.lstrip('-'), v) for f, v in zip(ordering, raw)]
+        except Exception as exc:
+            raise InvalidCursor(cursor) from exc
+        qs = qs.filter(keyset_after(ordering, values, reverse=direction == 'prev'))
+
+    if direction == 'prev':
+        flipped = tuple(f[1:] if f.startswith('-') else f'-{f}' for f in ordering)
+        rows = list(qs.order_by(*flipped)[:per_page + 1])
+        has_more = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        has_next, has_previous = True, has_more
+    else:
+        rows = list(qs.order_by(*ordering)[:per_page + 1])
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
+        has_next, has_previous = has_more, bool(cursor)
+
+    next_cursor = previous_cursor = None
+    if items and has_next:
+        next_cursor = encode_cursor(_key(items[-1], ordering), 'next')
+    if items and has_previous:
+        previous_cursor = encode_cursor(_key(items[0], ordering), 'prev')
+    return KeysetPage(items, next_cursor, previous_cursor)
+
+
+def approximate_count(qs, timeout=300):
+    """COUNT(*) for qs, cached for `timeout` seconds so it runs rarely."""
+    sql, params = qs.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+    return cache.get_or_set(f'approx-count:{digest}', qs.count, timeout)
@@ -0,0 +1,73 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from .models import Event, Registration
+
+
+class AlreadyRegistered(Exception):
+    """The email already has a registration for the event."""
+
+
+def claim_seat(event_id):
+    """Atomically take one seat on the event if any are left.
+
+    A single conditional UPDATE both checks and bumps the counter, so
+    concurrent registrations serialize on the event row instead of
+    counting the registrations table. A capacity of 0 means unlimited.
+    Returns True when a seat was claimed.
+    """
+    has_room = Q(capacity=0) | Q(seats_taken__lt=F('capacity'))
+    updated = (Event.objects.filter(pk=event_id)
+               .filter(has_room)
+               .update(seats_taken=F('seats_taken') + 1))
+    return updated == 1
+
+
+def claim_seats(event_id, count):
+    """Claim up to `count` seats at once (bulk imports); returns how many were granted.
+
+    Must run inside a transaction: the locking read holds the event row
+    until commit, so concurrent claims queue up instead of overselling.
+    """
+    capacity, taken = (Event.objects.select_for_update().filter(pk=event_id)
+                       .values_list('capacity', 'seats_taken').get())
+    granted = count if not capacity else min(count, max(capacity - taken, 0))
+    if granted:
+        Event.objects.filter(pk=event_id).update(seats_taken=F('seats_taken') + granted)
+    return granted
+
+
+def release_seat(event_id):
+    release_seats(event_id, 1)
+
+
+def release_seats(event_id, count):
+    Event.objects.filter(pk=event_id, seats_taken__gte=count).update(seats_taken=F('seats_taken') - count)
+
+
+def register(event, form):
+    """Save a valid RegistrationForm against event, enforcing capacity.
+
+    Returns the saved Registration, or None when the event is sold out.
+    Raises AlreadyRegistered when the email is already registered; that is
+    detected by the (event, email) unique constraint, so the common path
+    runs no extra SELECT, and confirmed with one after an IntegrityError.
+    """
+    reg = form.save(commit=False)
+    reg.event = event
+    try:
+        with transaction.atomic():
+            if not claim_seat(event.pk):
+                # rare path: a retry after taking the last seat should not read as sold out
+                if event.registrations.filter(email=reg.email).exists():
+                    raise AlreadyRegistered(reg.email)
+                return None
+            # the seat is already counted; tell the post_save handler to skip it
+            reg._seat_claimed = True
+            reg.save()
+    except IntegrityError:
+        # the rollback also gives back the seat claimed above; only the
+        # unique constraint means a duplicate, anything else propagates
+        if Registration.objects.filter(event=event, email=reg.email).exists():
+            raise AlreadyRegistered(reg.email)
+        raise
+    return reg
@@ -0,0 +1,66 @@
+"""The organizer's view of one event's registrations: a keyset-paginated table plus signup stats."""
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .pagination import InvalidCursor, paginate_keyset
+
+# ?sort= value -> keyset ordering; each is backed by an index that starts with event
+SORTS = {
+    'date': ('created_at', 'id'),
+    '-date': ('-created_at', '-id'),
+    'name': ('full_name', 'id'),
+    '-name': ('-full_name', '-id'),
+    'email': ('email', 'id'),
+    '-email': ('-email', '-id'),
+}
+DEFAULT_SORT = '-date'
+
+
+def registration_page(event, params, per_page):
+    """One page of event's registrations for the GET params sort, q and cursor.
+
+    Returns (page, sort, query); an unknown sort or a stale cursor falls
+    back to the defaults instead of failing.
+    """
+    sort = params.get('sort') if params.get('sort') in SORTS else DEFAULT_SORT
+    query = params.get('q', '').strip()
+    qs = event.registrations.all()
+    if query:
+        qs = qs.filter(Q(full_name__icontains=query) | Q(email__icontains=query))
+    try:
+        page = paginate_keyset(qs, params.get('cursor'), per_page, SORTS[sort])
+    except InvalidCursor:
+        page = paginate_keyset(qs, None, per_page, SORTS[sort])
+    return page, sort, query
+
+
+def as_json(reg):
+    return {
+        'id': reg.id,
+        'full_name': reg.full_name,
+        'email': reg.email,
+        'phone': reg.phone,
+        'created_at': timezone.localtime(reg.created_at).isoformat(),
+    }
+
+
+def signup_stats(event):
+    """Count, fill rate and a daily signup histogram, from one GROUP BY query.
+
+    The count comes from the seats_taken counter, so registrations that
+    were archived still show up in the totals.
+    """
+    days = list(event.registrations.order_by()
+                .annotate(day=TruncDate('created_at')).values('day')
+                .annotate(signups=Count('id')).order_by('day'))
+    peak = max((d['signups'] for d in days), default=0)
+    for d in days:
+        d['percent'] = round(100 * d['signups'] / peak)
+    total = event.seats_taken
+    return {
+        'total': total,
+        'capacity': event.capacity,
+        'fill_rate': round(100 * total / event.capacity, 1) if event.capacity else None,
+        'days': days,
+        'peak': peak,
+    }
@@ -0,0 +1,95 @@
+"""Full-text event search.
+
+SQLite keeps an FTS5 table (events_event_fts, rowid = event id) in step
+with Event through signals; MySQL uses a FULLTEXT index on events_event,
+which the server maintains itself. Other backends fall back to LIKE.
+"""
+import re
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from .models import Event
+
+FTS_TABLE = 'events_event_fts'
+# bm25 column weights: title matches count most, then venue, then description
+FTS_WEIGHTS = '10.0, 5.0, 1.0'
+
+
+def search_terms(query):
+    """Split user input into plain word tokens, dropping search operators."""
+    return re.findall(r'\w+', query.lower())[:10]
+
+
+def _vendor(model=Event):
+    return connections[router.db_for_read(model)].vendor
+
+
+def search(qs, query, ordering=('start_time', 'id')):
+    """Filter an Event queryset to matches for `query`, best matches first.
+
+    Returns (queryset, ordering); the ordering ends in 'id' so it can be
+    handed straight to paginate_keyset. Backends without a ranking keep
+    the `ordering` passed in.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return qs, ordering
+
+    vendor = _vendor()
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{t}"*' for t in terms)
+        # bm25() is lower-is-better, so sort ascending
+        rank = RawSQL(
+            f'(SELECT bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = events_event.id)', [match])
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        return qs.filter(pk__in=matches).annotate(search_rank=rank), ('search_rank', 'id')
+
+    if vendor == 'mysql':
+        match = ' '.join(f'+{t}*' for t in terms)
+        rank = RawSQL(
+            'MATCH (events_event.title, events_event.venue, events_event.description) '
+            'AGAINST (%s IN BOOLEAN MODE)', [match])
+        return qs.annotate(search_rank=rank).filter(search_rank__gt=0), ('-search_rank', 'id')
+
+    for term in terms:
+        qs = qs.filter(Q(title__icontains=term) | Q(venue__icontains=term) | Q(description__icontains=term))
+    return qs, ordering
+
+
+def index_event(event):
+    if _vendor() != 'sqlite':
+        return
+    with connections[router.db_for_write(Event)].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [event.pk])
+        if event.get_deferred_fields() & {'title', 'venue', 'description'}:
+            # a partially loaded instance: copy the saved row rather than fetch each field
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, venue, description) '
+                'SELECT id, title, venue, description FROM events_event WHERE id = %s', [event.pk])
+            return
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, venue, description) VALUES (%s, %s, %s, %s)',
+            [event.pk, event.title, event.venue, event.description])
+
+
+def unindex_event(event_id):
+    if _vendor() != 'sqlite':
+        return
+    with connections[router.db_for_write(Event)].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [event_id])
+
+
+def rebuild(using=None):
+    """Rebuild the search index from scratch; returns the number of indexed events."""
+    connection = connections[using or router.db_for_write(Event)]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, venue, description) '
+                'SELECT id, title, venue, description FROM events_event')
+        elif connection.vendor == 'mysql':
+            # FULLTEXT is maintained by InnoDB; OPTIMIZE folds in pending changes
+            cursor.execute('OPTIMIZE TABLE events_event')
+    return Event.objects.using(connection.alias).count()
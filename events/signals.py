@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .models import Event, Registration, Category
+from .counters import count_in_category, recount_categories, uncount_event
+from .registrations import release_seat
+from . import search, caching, categories
+
+
+@receiver(post_save, sender=Registration)
+def count_registration(sender, instance, created, **kwargs):
+    # Registrations made outside events.registrations.register (admin, shell)
+    # still take a seat, even if that overbooks the event.
+    if created and not getattr(instance, '_seat_claimed', False):
+        Event.objects.filter(pk=instance.event_id).update(seats_taken=F('seats_taken') + 1)
+    if created:
+        count_in_category(instance.event_id, 1)
+
+
+def _deleting_event(origin):
+    # origin is the instance or queryset delete() was called on
+    return (origin.model if isinstance(origin, QuerySet) else type(origin)) is Event
+
+
+@receiver(post_delete, sender=Registration)
+def uncount_registration(sender, instance, origin=None, **kwargs):
+    # a cascade from a deleted event is settled once by uncount_event_registrations
+    if _deleting_event(origin):
+        return
+    release_seat(instance.event_id)
+    count_in_category(instance.event_id, -1)
+
+
+@receiver(pre_delete, sender=Event)
+def uncount_event_registrations(sender, instance, **kwargs):
+    uncount_event(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+def move_category_count(sender, instance, created, **kwargs):
+    if 'category_id' in instance.get_deferred_fields():
+        # not loaded, so not changed (and not worth a query to find out)
+        return
+    old = getattr(instance, '_loaded_category_id', None)
+    if not created and old != instance.category_id:
+        recount_categories(Category.objects.filter(pk__in=[pk for pk in (old, instance.category_id) if pk]))
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, **kwargs):
+    search.index_event(instance)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+    search.unindex_event(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_fragments(sender, **kwargs):
+    # per-event fragments are keyed on updated_at; the featured list needs a bump,
+    # after commit like the category bumps below
+    transaction.on_commit(caching.invalidate_featured)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_fragments(sender, **kwargs):
+    # a bump before commit lets a concurrent request re-cache the old rows under the new version
+    transaction.on_commit(caching.invalidate_all)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_category_registry(sender, **kwargs):
+    # names, slugs and upcoming counts in the listing's category dropdown;
+    # after commit, for the same reason as above
+    transaction.on_commit(categories.invalidate)
@@ -0,0 +1,108 @@
+"""Unique slugs for models with a unique `slug` field.
+
+A title that is already taken gets the next free numeric suffix
+("meetup", "meetup-2", "meetup-3", ...). The suffixes in use are read
+with one range query on the slug index rather than by probing candidates
+one at a time, and assign_slugs() does the same for a whole batch before
+bulk_create(). Two concurrent saves can still pick the same slug, so
+save_with_slug() retries under a savepoint when the unique constraint
+rejects the insert.
+"""
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# bases per query; each adds a few terms to the WHERE clause
+BATCH_SIZE = 100
+SAVE_ATTEMPTS = 5
+
+
+def base_slug(model, text):
+    max_length = model._meta.get_field('slug').max_length
+    # leave room for a "-N" suffix
+    return slugify(text)[:max_length - 10].strip('-') or model._meta.model_name
+
+
+def _note(found, slug, bases):
+    """Record slug in found if it is one of bases or one of them plus "-N"."""
+    if slug in bases:
+        found.setdefault(slug, 0)
+    head, _, tail = slug.rpartition('-')
+    if tail.isdigit() and head in bases:
+        found[head] = max(found.get(head, 0), int(tail))
+
+
+def _highest_suffixes(model, bases, exclude_pk=None, using=None):
+    """{base: highest suffix in use} for the bases that are taken; a bare base counts as 0."""
+    bases = set(bases)
+    found = {}
+    ordered = sorted(bases)
+    for start in range(0, len(ordered), BATCH_SIZE):
+        lookup = Q()
+        for base in ordered[start:start + BATCH_SIZE]:
+            # "base-..." sorts between "base-" and "base." since "." follows "-"
+            lookup |= Q(slug=base) | Q(slug__gt=f'{base}-', slug__lt=f'{base}.')
+        qs = model._default_manager.db_manager(using).filter(lookup)
+        if exclude_pk is not None:
+            qs = qs.exclude(pk=exclude_pk)
+        for slug in qs.values_list('slug', flat=True).iterator():
+            _note(found, slug, bases)
+    return found
+
+
+def _with_suffix(base, highest):
+    # the first duplicate is "-2"; older rows may already use "-1"
+    return f'{base}-{max(highest, 1) + 1}'
+
+
+def next_slug(model, text, exclude_pk=None, using=None):
+    """A slug for text that no other row of model uses."""
+    base = base_slug(model, text)
+    highest = _highest_suffixes(model, [base], exclude_pk, using).get(base)
+    return base if highest is None else _with_suffix(base, highest)
+
+
+def assign_slugs(objs, field):
+    """Give every unsaved obj without a slug a unique one derived from obj.<field>.
+
+    Slugs are unique across the batch as well as the table, so objs can go
+    straight to bulk_create(). Returns objs.
+    """
+    pending = [obj for obj in objs if not obj.slug]
+    if not pending:
+        return objs
+    model = type(pending[0])
+    bases = [base_slug(model, getattr(obj, field)) for obj in pending]
+    highest = _highest_suffixes(model, bases)
+    # slugs the caller set are taken too
+    wanted = set(bases)
+    for obj in objs:
+        if obj.slug:
+            _note(highest, obj.slug, wanted)
+    for obj, base in zip(pending, bases):
+        if base in highest:
+            obj.slug = _with_suffix(base, highest[base])
+            highest[base] = max(highest[base], 1) + 1
+        else:
+            obj.slug = base
+            highest[base] = 0
+    return objs
+
+
+def save_with_slug(instance, text, save, *args, **kwargs):
+    """Call save(*args, **kwargs) after giving instance a free slug for text.
+
+    If a concurrent insert takes the same slug first, the unique constraint
+    fails inside a savepoint and the next free slug is tried.
+    """
+    model = type(instance)
+    using = kwargs.get('using') or router.db_for_write(model, instance=instance)
+    for attempt in range(SAVE_ATTEMPTS):
+        instance.slug = next_slug(model, text, instance.pk, using)
+        try:
+            with transaction.atomic(using=using):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            conflict = model._default_manager.using(using).filter(slug=instance.slug).exclude(pk=instance.pk)
+            if attempt == SAVE_ATTEMPTS - 1 or not conflict.exists():
+                raise
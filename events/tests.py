@@ -1,11 +1,15 @@
 from django.test import TestCase
 from django.urls import reverse
+from django.contrib.auth import get_user_model
 from .models import Event, Registration
 from django.utils import timezone
 
 
 class RegistrationFlowTests(TestCase):
     def setUp(self):
+        # event pages are only open to logged-in users
+        self.user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(self.user)
         self.event = Event.objects.create(
             title='Test Event',
             description='Desc',
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from .archive import archive_batch, archive_cutoff
+from .models import ArchivedRegistration, Event, Registration
+
+
+def make_event(title, days):
+    start = timezone.now() + timedelta(days=days)
+    return Event.objects.create(title=title, description='x', start_time=start, end_time=start, venue='Hall')
+
+
+class UpcomingPastTests(TestCase):
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_user('u', 'u@example.com', 'pass'))
+        self.old = make_event('Old gig', -30)
+        self.older = make_event('Older gig', -60)
+        self.soon = make_event('Soon gig', 2)
+        self.later = make_event('Later gig', 20)
+
+    def test_listing_defaults_to_upcoming(self):
+        resp = self.client.get(reverse('event_list'))
+        self.assertEqual([e.title for e in resp.context['events']], ['Soon gig', 'Later gig'])
+        self.assertEqual(resp.context['events'].count, 2)
+
+    def test_past_listing_is_newest_first(self):
+        resp = self.client.get(reverse('event_list'), {'when': 'past'})
+        self.assertEqual([e.title for e in resp.context['events']], ['Old gig', 'Older gig'])
+        self.assertContains(resp, 'Past Events')
+
+    def test_past_listing_pages_backwards_in_time(self):
+        for n in range(3):
+            make_event(f'Past {n}', -40 - n)
+        with self.settings(EVENT_LIST_PAGE_SIZE=2):
+            first = self.client.get(reverse('event_list'), {'when': 'past'})
+            second = self.client.get(reverse('event_list') + first.context['next_url'])
+        titles = [e.title for e in first.context['events']] + [e.title for e in second.context['events']]
+        self.assertEqual(titles, ['Old gig', 'Past 0', 'Past 1', 'Past 2'])
+
+    def test_home_features_upcoming_events(self):
+        resp = self.client.get(reverse('home'))
+        self.assertContains(resp, 'Soon gig')
+        self.assertNotContains(resp, 'Old gig')
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.ancient = make_event('Ancient', -800)
+        self.recent = make_event('Recent', -10)
+        for n in range(5):
+            Registration.objects.create(event=self.ancient, full_name=f'A{n}', email=f'a{n}@example.com')
+        Registration.objects.create(event=self.recent, full_name='R', email='r@example.com')
+
+    def test_command_moves_old_registrations_in_batches(self):
+        out = StringIO()
+        call_command('archive_registrations', '--batch-size', '2', stdout=out)
+        self.assertIn('Archived 5 registrations', out.getvalue())
+        self.assertEqual(list(Registration.objects.values_list('email', flat=True)), ['r@example.com'])
+        self.assertEqual(ArchivedRegistration.objects.filter(event=self.ancient).count(), 5)
+        # the event keeps its count, and reconciling agrees with it
+        self.ancient.refresh_from_db()
+        self.assertEqual(self.ancient.seats_taken, 5)
+        call_command('reconcile_counters', stdout=StringIO())
+        self.ancient.refresh_from_db()
+        self.assertEqual(self.ancient.seats_taken, 5)
+
+    def test_dry_run_moves_nothing(self):
+        out = StringIO()
+        call_command('archive_registrations', '--dry-run', stdout=out)
+        self.assertIn('5 registrations', out.getvalue())
+        self.assertEqual(Registration.objects.count(), 6)
+
+    def test_horizon_is_configurable(self):
+        self.assertEqual(archive_batch(archive_cutoff(days=5)), 6)
+        self.assertEqual(archive_batch(archive_cutoff(days=5)), 0)
@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from . import caching
+from .models import Event, Category
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caching.reset_fragment_stats()
+        self.category = Category.objects.create(name='Music')
+        self.event = Event.objects.create(
+            title='Jazz Night', description='Live band', start_time=timezone.now(),
+            end_time=timezone.now(), venue='Hall', category=self.category)
+
+    def test_featured_fragment_skips_query_on_hit(self):
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('home'))
+        self.assertContains(resp, 'Jazz Night')
+        self.assertFalse(any('events_event' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(caching.fragment_stats(), {'featured.miss': 1, 'featured.hit': 1})
+
+    def test_featured_invalidated_on_event_change(self):
+        self.client.get(reverse('home'))
+        self.event.title = 'Blues Night'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.event.save()
+            # until the save commits, a render would cache the old title again
+            self.assertNotContains(self.client.get(reverse('home')), 'Blues Night')
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(reverse('home')), 'Blues Night')
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(title='Poetry Slam', description='x', start_time=timezone.now(),
+                                 end_time=timezone.now(), venue='Cafe')
+        self.assertContains(self.client.get(reverse('home')), 'Poetry Slam')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertNotContains(self.client.get(reverse('home')), 'Blues Night')
+
+    def test_featured_varies_by_viewer(self):
+        self.assertNotContains(self.client.get(reverse('home')), 'btn-outline-danger')
+        staff = get_user_model().objects.create_user('staff1', 's1@example.com', 'pass', is_staff=True)
+        self.client.force_login(staff)
+        self.assertContains(self.client.get(reverse('home')), 'btn-outline-danger')
+
+    def test_event_detail_fragment_keyed_on_updated_at_and_category(self):
+        user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(user)
+        url = reverse('event_detail', kwargs={'slug': self.event.slug})
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(caching.fragment_stats()['event_detail.hit'], 1)
+
+        self.event.description = 'Acoustic set'
+        self.event.save()
+        self.assertContains(self.client.get(url), 'Acoustic set')
+
+        self.category.name = 'Live Music'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertContains(self.client.get(url), 'Live Music')
+
+    def test_stats_endpoint_is_staff_only(self):
+        staff = get_user_model().objects.create_user('staff1', 's1@example.com', 'pass', is_staff=True)
+        self.client.get(reverse('home'))
+        self.client.force_login(staff)
+        resp = self.client.get(reverse('cache_stats'))
+        self.assertEqual(resp.json()['featured.miss'], 1)
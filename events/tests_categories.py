@@ -0,0 +1,95 @@
+import time
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from . import caching, categories
+from .models import Category, Event
+
+
+class CategoryRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.music = Category.objects.create(name='Music')
+        self.art = Category.objects.create(name='Art')
+        self.event = self._make_event('Gig', self.music, days=2)
+        self._make_event('Old gig', self.music, days=-30)
+
+    def _make_event(self, title, category, days):
+        start = timezone.now() + timedelta(days=days)
+        return Event.objects.create(title=title, description='x', start_time=start, end_time=start,
+                                    venue='Hall', category=category)
+
+    def test_names_slugs_and_upcoming_counts(self):
+        self.assertEqual([(c.name, c.slug, c.upcoming) for c in categories.all_categories()],
+                         [('Art', 'art', 0), ('Music', 'music', 1)])
+        self.assertEqual(categories.by_slug('music').id, self.music.pk)
+        self.assertIsNone(categories.by_slug('nope'))
+
+    def test_loaded_once_until_something_changes(self):
+        categories.all_categories()
+        with self.assertNumQueries(0):
+            categories.all_categories()
+            categories.by_slug('art')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._make_event('Show', self.art, days=1)
+        self.assertEqual(categories.by_slug('art').upcoming, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertEqual(categories.by_slug('music').upcoming, 0)
+        self.art.name = 'Visual Art'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.art.save()
+        self.assertEqual(categories.by_slug('art').name, 'Visual Art')
+        Category.objects.filter(pk=self.art.pk).update(name='Fine Art')
+        caching.invalidate_all()
+        self.assertEqual(categories.by_slug('art').name, 'Fine Art')
+
+    def test_invalidated_only_after_commit(self):
+        categories.all_categories()
+        # until the transaction commits, other requests would rebuild from the old rows
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.art.name = 'Visual Art'
+            self.art.save()
+            self.assertEqual(categories.by_slug('art').name, 'Art')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(categories.by_slug('art').name, 'Visual Art')
+
+    def test_other_processes_reuse_the_shared_copy(self):
+        categories.all_categories()
+        categories._loaded = (None, (), {}, 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(categories.all_categories()), 2)
+
+    def test_changes_made_through_another_worker(self):
+        categories.all_categories()
+        # the version bump landed in another process's cache, never in ours
+        with self.captureOnCommitCallbacks():
+            Category.objects.create(name='Film')
+        self.assertEqual(categories.by_slug('film').name, 'Film')
+        self.assertIn('Film', [c.name for c in categories.all_categories()])
+        with self.captureOnCommitCallbacks():
+            self.art.name = 'Visual Art'
+            self.art.save()
+        # both the cache entry and this process's copy age out after FRAGMENT_CACHE_TIMEOUT
+        cache.delete(categories._loaded[0])
+        with mock.patch.object(categories.time, 'monotonic', return_value=time.monotonic() + 301):
+            self.assertEqual(categories.by_slug('art').name, 'Visual Art')
+
+    def test_event_list_filters_without_category_queries(self):
+        self.client.force_login(get_user_model().objects.create_user('attendee', 'a@example.com', 'pass'))
+        self.client.get(reverse('event_list'))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('event_list'), {'category': 'music'})
+        self.assertContains(resp, 'Music (1)')
+        self.assertEqual([e.title for e in resp.context['events']], ['Gig'])
+        # events still join their category for the cards; nothing reads the table on its own
+        self.assertFalse(any(' FROM "events_category"' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(self.client.get(reverse('event_list'), {'category': 'nope'}).status_code, 404)
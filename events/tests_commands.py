@@ -0,0 +1,100 @@
+import json
+import random
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from .management.commands.update_descriptions import KEYWORDS, classify
+from .models import Event, Registration, Category, OutboundEmail
+
+
+class ScaleSeedTests(TestCase):
+    def seed(self, **options):
+        args = {'scale': True, 'categories': 3, 'events': 7, 'registrations': 4, 'batch_size': 3, 'seed': 42}
+        args.update(options)
+        call_command('seed', stdout=StringIO(), **args)
+
+    def test_scale_seed_is_deterministic_and_idempotent(self):
+        self.seed()
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Event.objects.count(), 7)
+        self.assertEqual(Registration.objects.count(), 28)
+        snapshot = list(Event.objects.order_by('slug').values_list('slug', 'title', 'start_time', 'venue'))
+        self.assertTrue(all(e.seats_taken == 4 for e in Event.objects.all()))
+
+        self.seed()
+        self.assertEqual(Event.objects.count(), 7)
+        self.assertEqual(Registration.objects.count(), 28)
+
+        # a missing event is recreated exactly as before
+        Event.objects.get(slug='load-42-event-3').delete()
+        self.seed()
+        self.assertEqual(list(Event.objects.order_by('slug').values_list('slug', 'title', 'start_time', 'venue')), snapshot)
+        self.assertEqual(Registration.objects.count(), 28)
+
+
+class UpdateDescriptionsTests(TestCase):
+    def test_classify_matches_keyword_priority(self):
+        def old_classify(title):
+            for name, words in KEYWORDS:
+                if any(x in title.lower() for x in words):
+                    return name
+            return 'default'
+
+        rng = random.Random(7)
+        alphabet = 'abcdefghijklmnopqrstuvwxyz '
+        titles = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(2000)]
+        titles += ['Artech Meetup', 'DJ Night', 'Startup Yoga', 'Painting for Data Nerds', 'Quiet Evening']
+        for title in titles:
+            self.assertEqual(classify(title), old_classify(title), title)
+
+    def test_updates_only_descriptions_in_chunks(self):
+        now = timezone.now()
+        for title in ['Rock Concert', 'Hackathon', 'Quiet Evening']:
+            Event.objects.create(title=title, description='old', start_time=now, end_time=now, venue='Hall')
+        before = dict(Event.objects.values_list('title', 'updated_at'))
+
+        out = StringIO()
+        call_command('update_descriptions', '--dry-run', stdout=out)
+        self.assertIn('Dry run', out.getvalue())
+        self.assertEqual(set(Event.objects.values_list('description', flat=True)), {'old'})
+
+        call_command('update_descriptions', '--chunk-size', '2', stdout=StringIO())
+        events = {e.title: e for e in Event.objects.all()}
+        self.assertIn('music', events['Rock Concert'].description)
+        self.assertIn('technology', events['Hackathon'].description)
+        self.assertNotEqual(events['Quiet Evening'].description, 'old')
+        self.assertEqual({t: e.updated_at for t, e in events.items()}, before)
+
+
+class BenchmarkCommandTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.budgets = Path(tmp.name) / 'budgets.json'
+
+    def run_benchmark(self, *args):
+        out = StringIO()
+        call_command('benchmark', '--events', '30', '--registrations', '3', '--categories', '2',
+                     '--requests', '3', '--concurrency', '1', '--deep-pages', '2',
+                     '--budgets', str(self.budgets), *args, stdout=out)
+        return out.getvalue()
+
+    def test_reports_every_scenario_and_records_budgets(self):
+        out = self.run_benchmark('--update-budgets')
+        budgets = json.loads(self.budgets.read_text())
+        self.assertEqual(set(budgets), {'home', 'event_list', 'event_list_deep', 'event_detail', 'checkout', 'dashboard'})
+        for name in budgets:
+            self.assertIn(name, out)
+        # checkout registrations are cleaned up again
+        self.assertFalse(Registration.objects.filter(email__endswith='@bench.example.com').exists())
+        self.assertFalse(OutboundEmail.objects.exists())
+
+        self.assertIn('within their query budgets', self.run_benchmark('--skip-seed'))
+
+    def test_fails_when_over_budget(self):
+        self.budgets.write_text(json.dumps({'event_list': 1}))
+        with self.assertRaisesMessage(CommandError, 'event_list ran'):
+            self.run_benchmark('--only', 'event_list')
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from . import caching
+from .models import Category, Event, Registration
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(self.user)
+        start = timezone.now() + timedelta(days=3)
+        self.category = Category.objects.create(name='Music')
+        self.event = Event.objects.create(
+            title='Jazz Night', description='Live band', start_time=start, end_time=start,
+            venue='Hall', capacity=10, category=self.category)
+
+    def fetch(self, url, response=None):
+        headers = {}
+        if response is not None:
+            headers = {'HTTP_IF_NONE_MATCH': response['ETag']}
+        return self.client.get(url, **headers)
+
+    def primed(self, url):
+        # the first response sets the CSRF cookie the ETag depends on
+        self.client.get(url)
+        response = self.fetch(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        return response
+
+    def test_event_detail_not_modified_without_rendering(self):
+        url = reverse('event_detail', kwargs={'slug': self.event.slug})
+        first = self.primed(url)
+        self.assertIn('Last-Modified', first)
+        self.assertIn('private', first['Cache-Control'])
+        self.assertIn('Cookie', first['Vary'])
+        with self.assertNumQueries(3):  # session, user, event
+            again = self.fetch(url, first)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+        self.assertEqual(again.content, b'')
+
+        # a timestamp alone can't tell whether seats were taken since
+        since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(since.status_code, 200)
+
+    def test_event_detail_changes_with_seats_and_edits(self):
+        url = reverse('event_detail', kwargs={'slug': self.event.slug})
+        first = self.primed(url)
+        Registration.objects.create(event=self.event, full_name='A', email='b@example.com')
+        after_signup = self.fetch(url, first)
+        self.assertEqual(after_signup.status_code, 200)
+        self.assertContains(after_signup, 'Seats left:</strong> 9')
+
+        self.event.refresh_from_db()
+        self.event.title = 'Blues Night'
+        self.event.save()
+        self.assertContains(self.fetch(url, after_signup), 'Blues Night')
+
+        current = self.fetch(url)
+        caching.invalidate_all()
+        self.assertEqual(self.fetch(url, current).status_code, 200)
+
+    def test_event_list_varies_by_viewer_and_contents(self):
+        url = reverse('event_list')
+        first = self.primed(url)
+        self.assertEqual(first['Last-Modified'], http_date(self.event.updated_at.timestamp()))
+        self.assertEqual(self.fetch(url, first).status_code, 304)
+
+        # organizers see edit/delete buttons on their own events
+        self.event.organizer = self.user
+        self.event.save()
+        owned = self.fetch(url, first)
+        self.assertContains(owned, 'Delete')
+
+        self.event.delete()
+        self.assertNotContains(self.fetch(url, owned), 'Jazz Night')
+
+        other = get_user_model().objects.create_user('other', 'o@example.com', 'pass', is_staff=True)
+        current = self.fetch(url)
+        self.client.force_login(other)
+        self.client.get(url)
+        self.assertEqual(self.fetch(url, current).status_code, 200)
+
+    def test_pages_with_messages_are_not_cached(self):
+        url = reverse('event_detail', kwargs={'slug': self.event.slug})
+        self.primed(url)
+        self.client.post(url, {'full_name': 'A', 'email': 'a@example.com', 'phone': ''})
+        response = self.client.get(url)
+        self.assertContains(response, 'Registration Successful')
+        self.assertNotIn('ETag', response)
+
+    def test_payment_success(self):
+        url = reverse('payment_success', kwargs={'slug': self.event.slug})
+        first = self.primed(url)
+        self.assertEqual(self.fetch(url, first).status_code, 304)
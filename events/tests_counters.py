@@ -0,0 +1,100 @@
+import io
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase
+from django.utils import timezone
+from . import search
+from .imports import import_registrations
+from .models import Category, Event, Registration
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.music = Category.objects.create(name='Music')
+        self.art = Category.objects.create(name='Art')
+        self.event = Event.objects.create(
+            title='Gig', description='x', start_time=timezone.now(), end_time=timezone.now(),
+            venue='Hall', category=self.music)
+
+    def counts(self):
+        self.event.refresh_from_db()
+        return (self.event.seats_taken,
+                Category.objects.get(pk=self.music.pk).registration_count,
+                Category.objects.get(pk=self.art.pk).registration_count)
+
+    def test_registrations_move_event_and_category_counters(self):
+        a = Registration.objects.create(event=self.event, full_name='A', email='a@example.com')
+        Registration.objects.create(event=self.event, full_name='B', email='b@example.com')
+        self.assertEqual(self.counts(), (2, 2, 0))
+        a.delete()
+        self.assertEqual(self.counts(), (1, 1, 0))
+
+    def test_saving_a_stale_instance_keeps_counters(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        Registration.objects.create(event=self.event, full_name='A', email='a@example.com')
+        stale.title = 'Renamed'
+        stale.save()
+        self.music.save()
+        self.assertEqual(self.counts(), (1, 1, 0))
+
+    def test_saving_a_partial_instance_writes_only_loaded_fields(self):
+        partial = Event.objects.only('title', 'slug').get(pk=self.event.pk)
+        Event.objects.filter(pk=self.event.pk).update(venue='Arena')
+        partial.title = 'Renamed'
+        # the UPDATE and the two search index statements; no deferred field is fetched
+        with self.assertNumQueries(3):
+            partial.save()
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.title, self.event.venue), ('Renamed', 'Arena'))
+        self.assertEqual([e.pk for e in search.search(Event.objects.all(), 'arena', ('id',))[0]], [self.event.pk])
+
+    def test_changing_category_moves_the_count(self):
+        Registration.objects.create(event=self.event, full_name='A', email='a@example.com')
+        self.event.category = self.art
+        self.event.save()
+        self.assertEqual(self.counts(), (1, 0, 1))
+        self.event.category = None
+        self.event.save()
+        self.assertEqual(self.counts(), (1, 0, 0))
+
+    def test_deleting_an_event_settles_counters_once(self):
+        other = Event.objects.create(title='Other gig', description='x', start_time=timezone.now(),
+                                     end_time=timezone.now(), venue='Hall', category=self.music)
+        Registration.objects.create(event=other, full_name='O', email='o@example.com')
+
+        def delete_with(n):
+            ev = Event.objects.create(title=f'Big gig {n}', description='x', start_time=timezone.now(),
+                                      end_time=timezone.now(), venue='Hall', category=self.music)
+            Registration.objects.bulk_create(
+                Registration(event=ev, full_name='G', email=f'g{i}@example.com') for i in range(n))
+            Event.objects.filter(pk=ev.pk).update(seats_taken=n)
+            Category.objects.filter(pk=self.music.pk).update(registration_count=F('registration_count') + n)
+            with CaptureQueriesContext(connection) as ctx:
+                ev.delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(delete_with(2), delete_with(50))
+        self.assertEqual(self.counts(), (0, 1, 0))
+        self.assertFalse(Registration.objects.filter(full_name='G').exists())
+
+        self.event.delete()
+        Event.objects.filter(pk=other.pk).delete()
+        self.assertEqual(Category.objects.get(pk=self.music.pk).registration_count, 0)
+
+    def test_import_updates_category(self):
+        import_registrations(self.event, io.StringIO('full_name,email\nA,a@example.com\nB,b@example.com\n'))
+        self.assertEqual(self.counts(), (2, 2, 0))
+
+    def test_reconcile_fixes_drift(self):
+        Registration.objects.create(event=self.event, full_name='A', email='a@example.com')
+        Event.objects.filter(pk=self.event.pk).update(seats_taken=7)
+        Category.objects.filter(pk=self.art.pk).update(registration_count=3)
+        out = io.StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('Corrected 1 event and 1 category counters.', out.getvalue())
+        self.assertEqual(self.counts(), (1, 1, 0))
+        out = io.StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('Corrected 0 event and 0 category counters.', out.getvalue())
@@ -0,0 +1,64 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .models import Event, Registration, Category
+
+
+class DashboardQueryTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user('staff1', 's1@example.com', 'pass', is_staff=True)
+        self.other = User.objects.create_user('staff2', 's2@example.com', 'pass', is_staff=True)
+        self.client.force_login(self.staff)
+
+    def _make_event(self, title, category=None, organizer=None):
+        return Event.objects.create(
+            title=title,
+            description='x',
+            start_time=timezone.now(),
+            end_time=timezone.now(),
+            venue='Hall',
+            capacity=10,
+            category=category,
+            organizer=organizer or self.staff,
+        )
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('dashboard'))
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_category_count(self):
+        cat = Category.objects.create(name='Cat 0')
+        ev = self._make_event('Event 0', cat)
+        Registration.objects.create(event=ev, full_name='A', email='a@example.com')
+        baseline = self._count_queries()
+
+        for i in range(1, 8):
+            cat = Category.objects.create(name=f'Cat {i}')
+            ev = self._make_event(f'Event {i}', cat)
+            Registration.objects.create(event=ev, full_name='B', email=f'b{i}@example.com')
+        self._make_event('Loose event')
+
+        self.assertEqual(self._count_queries(), baseline)
+
+    def test_groups_and_stats(self):
+        music = Category.objects.create(name='Music')
+        art = Category.objects.create(name='Art')
+        ev1 = self._make_event('Gig', music)
+        self._make_event('Gallery', art)
+        self._make_event('Loose')
+        self._make_event('Not mine', music, organizer=self.other)
+        Registration.objects.create(event=ev1, full_name='A', email='a@example.com')
+        Registration.objects.create(event=ev1, full_name='B', email='b@example.com')
+
+        resp = self.client.get(reverse('dashboard'))
+        groups = [(cat.name if cat else None, [e.title for e in evs])
+                  for cat, evs in resp.context['categorized_events']]
+        self.assertEqual(groups, [('Art', ['Gallery']), ('Music', ['Gig']), (None, ['Loose'])])
+        self.assertEqual(resp.context['stats'], {'total_events': 3, 'total_registrations': 2})
+        self.assertEqual(len(resp.context['registrations']), 2)
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from .exports import iter_rows
+from .models import Event, Registration
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user('staff1', 's1@example.com', 'pass', is_staff=True)
+        self.other = User.objects.create_user('staff2', 's2@example.com', 'pass', is_staff=True)
+        self.event = self.make_event('Gig', self.staff)
+        self.other_event = self.make_event('Other', self.other)
+        for n in range(5):
+            Registration.objects.create(event=self.event, full_name=f'Guest {n}', email=f'g{n}@example.com')
+        Registration.objects.create(event=self.other_event, full_name='Stranger', email='s@example.com')
+        self.client.force_login(self.staff)
+
+    def make_event(self, title, organizer):
+        return Event.objects.create(title=title, description='x', start_time=timezone.now(),
+                                    end_time=timezone.now(), venue='Hall', organizer=organizer)
+
+    def body(self, resp):
+        return b''.join(resp.streaming_content).decode()
+
+    def test_event_csv(self):
+        resp = self.client.get(reverse('export_event_registrations', args=[self.event.pk, 'csv']))
+        self.assertEqual(resp['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(self.body(resp))))
+        self.assertEqual(rows[0], ['id', 'event', 'full_name', 'email', 'phone', 'registered_at'])
+        self.assertEqual([r[2] for r in rows[1:]], [f'Guest {n}' for n in range(5)])
+
+    def test_csv_neutralizes_formulas(self):
+        Registration.objects.create(event=self.event, full_name='=HYPERLINK("http://x.example","click")',
+                                    email='+cmd@example.com', phone='-1+1')
+        resp = self.client.get(reverse('export_event_registrations', args=[self.event.pk, 'csv']))
+        row = list(csv.reader(io.StringIO(self.body(resp))))[-1]
+        self.assertEqual(row[2:5], ["'=HYPERLINK(\"http://x.example\",\"click\")", "'+cmd@example.com", "'-1+1"])
+
+        resp = self.client.get(reverse('export_event_registrations', args=[self.event.pk, 'ndjson']))
+        record = json.loads(self.body(resp).splitlines()[-1])
+        self.assertEqual(record['full_name'], '=HYPERLINK("http://x.example","click")')
+
+    def test_organizer_ndjson_only_includes_own_events(self):
+        resp = self.client.get(reverse('export_my_registrations', args=['ndjson']))
+        records = [json.loads(line) for line in self.body(resp).splitlines()]
+        self.assertEqual(len(records), 5)
+        self.assertEqual({r['event'] for r in records}, {'Gig'})
+
+    def test_unknown_format_and_non_staff(self):
+        resp = self.client.get(reverse('export_event_registrations', args=[self.event.pk, 'xml']))
+        self.assertEqual(resp.status_code, 404)
+        attendee = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(attendee)
+        resp = self.client.get(reverse('export_event_registrations', args=[self.event.pk, 'csv']))
+        self.assertEqual(resp.status_code, 302)
+
+    def test_rows_are_read_in_chunks(self):
+        with self.assertNumQueries(4):
+            rows = list(iter_rows(Registration.objects.all(), chunk_size=2))
+        self.assertEqual(len(rows), 6)
+
+    def test_admin_action(self):
+        admin = get_user_model().objects.create_superuser('root', 'r@example.com', 'pass')
+        self.client.force_login(admin)
+        resp = self.client.post(reverse('admin:events_registration_changelist'), {
+            'action': 'export_csv',
+            '_selected_action': list(Registration.objects.values_list('pk', flat=True)),
+        })
+        self.assertEqual(len(self.body(resp).splitlines()), 7)
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from .ical import escape, feed_token, fold, iter_events
+from .models import Category, Event
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = get_user_model().objects.create_user('org', 'o@example.com', 'pass', is_staff=True)
+        self.music = Category.objects.create(name='Music')
+        self.gig = self.make_event('Jazz, Blues; & more', days=2, category=self.music, organizer=self.organizer)
+        self.talk = self.make_event('Talk', days=1)
+        self.old = self.make_event('Long gone', days=-90)
+
+    def make_event(self, title, days, **kwargs):
+        start = timezone.now() + timedelta(days=days)
+        return Event.objects.create(title=title, description='Line one\nLine two', start_time=start,
+                                    end_time=start + timedelta(hours=2), venue='Hall', **kwargs)
+
+    def feed(self, url, user=None, **headers):
+        token = feed_token(user or self.organizer)
+        return self.client.get(url, {'token': token}, **headers)
+
+    def body(self, resp):
+        # a streamed body can only be read once
+        if not hasattr(resp, 'text'):
+            resp.text = (b''.join(resp.streaming_content) if resp.streaming else resp.content).decode()
+        return resp.text
+
+    def summaries(self, resp):
+        return [line[len('SUMMARY:'):] for line in self.body(resp).split('\r\n') if line.startswith('SUMMARY:')]
+
+    def test_all_events_feed(self):
+        resp = self.feed(reverse('calendar_feed'))
+        self.assertEqual(resp['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn('public', resp['Cache-Control'])
+        self.assertNotIn('Vary', resp)
+        body = self.body(resp)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        # by start time, recent past and upcoming only
+        self.assertEqual(self.summaries(resp), ['Talk', 'Jazz\\, Blues\\; & more'])
+        self.assertIn(f'UID:event-{self.gig.pk}@testserver', body)
+        self.assertIn('DESCRIPTION:Line one\\nLine two', body)
+        self.assertIn(f'URL:http://testserver/events/{self.gig.slug}/', body)
+        self.assertIn('CATEGORIES:Music', body)
+
+    def test_category_and_organizer_feeds(self):
+        resp = self.feed(reverse('category_calendar_feed', args=['music']))
+        self.assertEqual(self.summaries(resp), ['Jazz\\, Blues\\; & more'])
+        self.assertIn('X-WR-CALNAME:AuraLink: Music', self.body(resp))
+        resp = self.feed(reverse('organizer_calendar_feed', args=[self.organizer.pk]))
+        self.assertEqual(self.summaries(resp), ['Jazz\\, Blues\\; & more'])
+        self.assertIn(f'X-WR-CALNAME:AuraLink: Organizer {self.organizer.pk}', self.body(resp))
+        self.assertEqual(self.feed(reverse('category_calendar_feed', args=['nope'])).status_code, 404)
+        self.assertEqual(self.feed(reverse('organizer_calendar_feed', args=[999])).status_code, 404)
+        # accounts without events (attendees, admins) have no feed
+        attendee = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.assertEqual(self.feed(reverse('organizer_calendar_feed', args=[attendee.pk]), attendee).status_code, 404)
+
+    def test_feeds_need_a_valid_token(self):
+        url = reverse('calendar_feed')
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url, {'token': f'{self.organizer.pk}:forged'}).status_code, 404)
+        attendee = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.assertEqual(self.feed(url, attendee).status_code, 200)
+        # another user's token does not open an organizer feed
+        organizer_url = reverse('organizer_calendar_feed', args=[self.organizer.pk])
+        self.assertEqual(self.feed(organizer_url, attendee).status_code, 404)
+        # the pages link each signed-in user to their own feed URLs
+        self.client.force_login(self.organizer)
+        query = f'?token={feed_token(self.organizer)}'.replace(':', '%3A')
+        self.assertContains(self.client.get(reverse('dashboard')), organizer_url + query)
+        self.assertContains(self.client.get(reverse('event_list')), url + query)
+
+    def test_polling_is_cheap(self):
+        url = reverse('calendar_feed')
+        first = self.feed(url)
+        self.body(first)
+        with self.assertNumQueries(1):
+            again = self.feed(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+        # a new subscriber is served the cached body
+        with self.assertNumQueries(1):
+            fresh = self.feed(url)
+        self.assertFalse(fresh.streaming)
+        self.assertEqual(self.summaries(fresh), ['Talk', 'Jazz\\, Blues\\; & more'])
+
+    def test_etag_follows_edits_additions_and_deletions(self):
+        url = reverse('calendar_feed')
+        etags = [self.feed(url)['ETag']]
+        self.talk.title = 'Keynote'
+        self.talk.save()
+        etags.append(self.feed(url)['ETag'])
+        self.make_event('Workshop', days=5)
+        etags.append(self.feed(url)['ETag'])
+        self.gig.delete()
+        resp = self.feed(url, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.summaries(resp), ['Keynote', 'Workshop'])
+        self.assertEqual(len(set(etags + [resp['ETag']])), 4)
+
+    def test_streams_in_chunks(self):
+        for n in range(7):
+            self.make_event(f'Extra {n}', days=3)
+        qs = Event.objects.all()
+        self.assertEqual([row[0] for row in iter_events(qs, chunk_size=3)],
+                         list(qs.order_by('start_time', 'id').values_list('id', flat=True)))
+
+    def test_text_escaping_and_folding(self):
+        self.assertEqual(escape('a,b;c\\d\r\ne'), 'a\\,b\\;c\\\\d\\ne')
+        line = 'DESCRIPTION:' + 'é' * 100
+        folded = fold(line)
+        pieces = folded[:-2].split('\r\n ')
+        self.assertTrue(all(len(p.encode()) <= 75 for p in pieces))
+        self.assertEqual(''.join(pieces), line)
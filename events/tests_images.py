@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .images import generate_renditions
+from .models import Event
+
+
+def jpeg_upload(width, height, name='photo.jpg'):
+    img = Image.new('RGB', (width, height), (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x010F] = 'PhoneMaker'  # Make
+    buf = BytesIO()
+    img.save(buf, 'JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile(name, buf.getvalue(), content_type='image/jpeg')
+
+
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media, EVENT_IMAGE_WIDTHS=(320, 640, 1280))
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media, ignore_errors=True)
+
+    def make_event(self, image):
+        return Event.objects.create(title='Photo Event', description='x', start_time=timezone.now(),
+                                    end_time=timezone.now(), venue='Hall', image=image)
+
+    def test_command_backfills_pending_events(self):
+        event = self.make_event(jpeg_upload(1000, 500))
+        self.assertEqual(event.image_renditions, {})
+        call_command('process_images', stdout=StringIO())
+        event.refresh_from_db()
+
+        self.assertEqual([w for w, _ in event.image_renditions['webp']], [320, 640, 1000])
+        self.assertEqual([w for w, _ in event.image_renditions['jpeg']], [320, 640, 1000])
+        with event.image.storage.open(event.image_renditions['jpeg'][0][1]) as fh:
+            small = Image.open(fh)
+            self.assertEqual(small.size, (320, 160))
+            self.assertEqual(len(small.getexif()), 0)
+        self.assertIn('320w', event.webp_srcset)
+        self.assertTrue(event.image_fallback_url.endswith('-640.jpg'))
+
+    def test_replacing_image_resets_renditions(self):
+        event = self.make_event(jpeg_upload(400, 400))
+        generate_renditions(event)
+        event = Event.objects.get(pk=event.pk)
+        self.assertEqual([w for w, _ in event.image_renditions['jpeg']], [320, 400])
+
+        event.title = 'Renamed'
+        event.save()
+        self.assertNotEqual(Event.objects.get(pk=event.pk).image_renditions, {})
+
+        # instances loaded without the image leave the renditions alone
+        for partial in (Event.objects.defer('image').get(pk=event.pk),
+                        Event.objects.only('title', 'image_renditions').get(pk=event.pk)):
+            partial.title = 'Renamed again'
+            partial.save()
+            self.assertNotEqual(Event.objects.get(pk=event.pk).image_renditions, {})
+
+        event.image = jpeg_upload(200, 100, name='other.jpg')
+        event.save()
+        self.assertEqual(Event.objects.get(pk=event.pk).image_renditions, {})
+
+    def test_broken_image_is_not_retried(self):
+        event = self.make_event(SimpleUploadedFile('bad.jpg', b'not an image', content_type='image/jpeg'))
+        call_command('process_images', stdout=StringIO())
+        event.refresh_from_db()
+        self.assertIn('error', event.image_renditions)
+        self.assertEqual(event.webp_srcset, '')
@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from . import imports
+from .imports import import_registrations
+from .models import Category, Event, Registration
+
+CSV = '''full_name,email,phone
+Ann,ann@example.com,1
+Bob,BOB@example.com,
+Dup,ann@example.com,
+,noname@example.com,
+Bad,not-an-email,
+Old,existing@example.com,
+Cat,cat@example.com,
+Dan,dan@example.com,
+'''
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(title='Fest', description='x', start_time=timezone.now(),
+                                          end_time=timezone.now(), venue='Hall', capacity=4)
+        Registration.objects.create(event=self.event, full_name='Old', email='Existing@example.com')
+
+    def test_validates_dedups_and_respects_capacity(self):
+        result = import_registrations(self.event, io.StringIO(CSV), chunk_size=2)
+        self.assertEqual(result.created, 3)
+        reasons = {line: reason for line, reason, _ in result.rejected}
+        self.assertEqual(reasons, {
+            4: 'already registered',
+            5: 'missing full_name',
+            6: 'invalid email',
+            7: 'already registered',
+            9: 'event is full',
+        })
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 4)
+        self.assertEqual(sorted(self.event.registrations.values_list('email', flat=True)),
+                         ['Existing@example.com', 'ann@example.com', 'bob@example.com', 'cat@example.com'])
+
+    def test_dry_run_writes_nothing(self):
+        result = import_registrations(self.event, io.StringIO(CSV), dry_run=True)
+        self.assertEqual(result.created, 3)
+        self.assertEqual(Registration.objects.count(), 1)
+
+    def test_missing_columns(self):
+        with self.assertRaises(ValueError):
+            import_registrations(self.event, io.StringIO('name,mail\nA,a@example.com\n'))
+
+    def test_query_count_independent_of_rows(self):
+        self.event.capacity = 0
+        self.event.save()
+        rows = ''.join(f'Guest {n},guest{n}@example.com,\n' for n in range(3000))
+        with CaptureQueriesContext(connection) as ctx:
+            result = import_registrations(self.event, io.StringIO('full_name,email,phone\n' + rows), chunk_size=1000)
+        self.assertEqual(result.created, 3000)
+        # one existing-email lookup, then a handful of statements per chunk
+        # (a savepoint, and sqlite splits each bulk insert by its variable limit)
+        self.assertLess(len(ctx.captured_queries), 50)
+
+    def test_registration_committed_mid_import(self):
+        self.event.category = Category.objects.create(name='Music')
+        self.event.save()
+        claim_seats = imports.claim_seats
+
+        def web_signup_first(event_id, count):
+            # someone registers on the site after the existing emails were read
+            Registration.objects.create(event=self.event, full_name='Cat', email='cat@example.com')
+            return claim_seats(event_id, count)
+
+        with mock.patch.object(imports, 'claim_seats', web_signup_first):
+            result = import_registrations(self.event, io.StringIO('full_name,email\nAnn,ann@example.com\n'
+                                                                  'Cat,cat@example.com\n'))
+        self.assertEqual(result.created, 1)
+        self.assertEqual([(line, reason) for line, reason, _ in result.rejected], [(3, 'already registered')])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 3)
+        self.assertEqual(self.event.category.registration_count, 3)
+        self.assertEqual(self.event.registrations.count(), 3)
+
+    def test_command_writes_rejects(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'in.csv')
+            rejects = os.path.join(tmp, 'rejects.csv')
+            with open(src, 'w') as fh:
+                fh.write(CSV)
+            out = io.StringIO()
+            call_command('import_registrations', self.event.slug, src, '--rejects', rejects, stdout=out)
+            self.assertIn('Imported 3 registrations', out.getvalue())
+            with open(rejects) as fh:
+                self.assertEqual(len(fh.readlines()), 6)
+
+    def test_dashboard_upload(self):
+        staff = get_user_model().objects.create_user('staff1', 's1@example.com', 'pass', is_staff=True)
+        self.client.force_login(staff)
+        upload = SimpleUploadedFile('regs.csv', CSV.encode(), content_type='text/csv')
+        resp = self.client.post(reverse('import_event_registrations', args=[self.event.pk]), {'file': upload})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['result'].created, 3)
+        self.assertContains(resp, 'invalid email')
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from io import StringIO
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .models import Event, OutboundEmail
+from .outbox import enqueue, drain
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('smtp down')
+
+
+class CrashingBackend(BaseEmailBackend):
+    """Delivers one message, then dies like a killed worker."""
+    delivered = []
+
+    def send_messages(self, email_messages):
+        if self.delivered:
+            raise SystemExit('worker killed')
+        self.delivered.extend(email_messages)
+        return len(email_messages)
+
+
+class FlakyBackend(BaseEmailBackend):
+    """Fails the first message; counts how often the connection is opened."""
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return True
+
+    def send_messages(self, email_messages):
+        if email_messages[0].to == ['flaky@example.com']:
+            raise ConnectionError('connection reset')
+        return len(email_messages)
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(self.user)
+        self.event = Event.objects.create(
+            title='Mail Event',
+            description='x',
+            start_time=timezone.now(),
+            end_time=timezone.now(),
+            venue='Hall',
+            capacity=10,
+        )
+
+    def test_registration_only_enqueues(self):
+        self.client.post(reverse('event_detail', kwargs={'slug': self.event.slug}), {
+            'full_name': 'John Doe',
+            'email': 'john@example.com',
+            'phone': '',
+        })
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutboundEmail.objects.get()
+        self.assertEqual(queued.recipients, ['john@example.com'])
+
+        call_command('send_queued_mail', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['john@example.com'])
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboundEmail.SENT)
+
+    def test_drain_sends_in_batches(self):
+        for n in range(7):
+            enqueue('Hi', 'Body', [f'user{n}@example.com'])
+        self.assertEqual(drain(batch_size=3), (7, 0))
+        self.assertEqual(len(mail.outbox), 7)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.SENT).exists())
+
+    @override_settings(EMAIL_BACKEND='events.tests_outbox.FailingBackend',
+                       EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+    def test_failures_back_off_then_dead_letter(self):
+        msg = enqueue('Hi', 'Body', ['user@example.com'])
+        self.assertEqual(drain(), (0, 1))
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, OutboundEmail.PENDING)
+        self.assertEqual(msg.attempts, 1)
+        self.assertIn('smtp down', msg.last_error)
+        self.assertGreater(msg.next_attempt_at, timezone.now() + timedelta(seconds=30))
+
+        # not due yet, so nothing is attempted
+        self.assertEqual(drain(), (0, 0))
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(drain(), (0, 1))
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, OutboundEmail.DEAD)
+        self.assertEqual(msg.attempts, 2)
+
+    def test_crashed_worker_does_not_resend_delivered_messages(self):
+        first = enqueue('Hi', 'Body', ['first@example.com'])
+        second = enqueue('Hi', 'Body', ['second@example.com'])
+        CrashingBackend.delivered = []
+        with self.settings(EMAIL_BACKEND='events.tests_outbox.CrashingBackend'):
+            with self.assertRaises(SystemExit):
+                drain()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, OutboundEmail.SENT)
+        self.assertEqual(second.status, OutboundEmail.SENDING)
+
+        # leased: another worker leaves it alone until the lease runs out
+        self.assertEqual(drain(), (0, 0))
+        OutboundEmail.objects.filter(pk=second.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(drain(), (1, 0))
+        self.assertEqual([m.to for m in mail.outbox], [['second@example.com']])
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.attempts), (OutboundEmail.SENT, 2))
+
+    def test_connection_reopened_once_after_a_failure(self):
+        enqueue('Hi', 'Body', ['flaky@example.com'])
+        for n in range(3):
+            enqueue('Hi', 'Body', [f'guest{n}@example.com'])
+        FlakyBackend.opened = 0
+        with self.settings(EMAIL_BACKEND='events.tests_outbox.FlakyBackend'):
+            self.assertEqual(drain(), (3, 1))
+        self.assertEqual(FlakyBackend.opened, 2)
+
+    def test_requeue_leaves_leased_messages_alone(self):
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(admin)
+        now = timezone.now()
+        leased = OutboundEmail.objects.create(subject='Hi', body='x', from_email='f@example.com', to='a@example.com',
+                                              status=OutboundEmail.SENDING, attempts=1,
+                                              next_attempt_at=now + timedelta(minutes=5))
+        expired = OutboundEmail.objects.create(subject='Hi', body='x', from_email='f@example.com', to='b@example.com',
+                                               status=OutboundEmail.SENDING, attempts=1,
+                                               next_attempt_at=now - timedelta(minutes=1))
+        dead = OutboundEmail.objects.create(subject='Hi', body='x', from_email='f@example.com', to='c@example.com',
+                                            status=OutboundEmail.DEAD, attempts=5)
+        self.client.post(reverse('admin:events_outboundemail_changelist'),
+                         {'action': 'requeue', '_selected_action': [leased.pk, expired.pk, dead.pk]})
+        statuses = dict(OutboundEmail.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {leased.pk: OutboundEmail.SENDING, expired.pk: OutboundEmail.PENDING,
+                                    dead.pk: OutboundEmail.PENDING})
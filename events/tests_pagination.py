@@ -0,0 +1,107 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from . import categories
+from .models import Event, Category
+from .pagination import paginate_keyset, encode_cursor, decode_cursor
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        start = timezone.now()
+        self.music = Category.objects.create(name='Music')
+        # pairs share a start_time so the id tie-breaker matters
+        for n in range(11):
+            Event.objects.create(
+                title=f'Event {n}',
+                description='x',
+                start_time=start + timedelta(days=n // 2),
+                end_time=start + timedelta(days=n // 2),
+                venue='Hall',
+                category=self.music if n % 3 == 0 else None,
+            )
+        self.ordered = list(Event.objects.order_by('start_time', 'id'))
+
+    def test_walk_forward_and_back(self):
+        seen = []
+        page = paginate_keyset(Event.objects.all(), None, 4)
+        self.assertFalse(page.has_previous())
+        pages = [page]
+        while page.has_next():
+            page = paginate_keyset(Event.objects.all(), page.next_cursor, 4)
+            pages.append(page)
+        for p in pages:
+            seen.extend(p)
+        self.assertEqual(seen, self.ordered)
+        self.assertEqual([len(p) for p in pages], [4, 4, 3])
+
+        back = paginate_keyset(Event.objects.all(), pages[-1].previous_cursor, 4)
+        self.assertEqual(list(back), list(pages[1]))
+        back = paginate_keyset(Event.objects.all(), back.previous_cursor, 4)
+        self.assertEqual(list(back), list(pages[0]))
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor([timezone.now(), 5], 'next')
+        values, direction = decode_cursor(cursor)
+        self.assertEqual(direction, 'next')
+        self.assertEqual(values[1], 5)
+
+
+class EventListCursorTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(user)
+        self.music = Category.objects.create(name='Music')
+        for n in range(9):
+            Event.objects.create(
+                title=f'Event {n}',
+                description='x',
+                start_time=timezone.now() + timedelta(days=n),
+                end_time=timezone.now() + timedelta(days=n),
+                venue='Hall',
+                category=self.music if n % 2 == 0 else None,
+            )
+        # the category dropdown is built once per change, not per request
+        categories.all_categories()
+
+    @override_settings(EVENT_LIST_PAGE_SIZE=2, EVENT_LIST_COUNT='none')
+    def test_category_filter_kept_across_pages(self):
+        url = reverse('event_list')
+        resp = self.client.get(url, {'category': 'music'})
+        titles = [e.title for e in resp.context['events']]
+        self.assertEqual(titles, ['Event 0', 'Event 2'])
+        self.assertIn('category=music', resp.context['next_url'])
+
+        resp = self.client.get(url + resp.context['next_url'])
+        self.assertEqual([e.title for e in resp.context['events']], ['Event 4', 'Event 6'])
+        self.assertIsNotNone(resp.context['previous_url'])
+
+    @override_settings(EVENT_LIST_PAGE_SIZE=2, EVENT_LIST_COUNT='none')
+    def test_no_count_or_offset_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('event_list'))
+        sql = ' '.join(q['sql'] for q in ctx.captured_queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    @override_settings(EVENT_LIST_COUNT='none')
+    def test_query_count_independent_of_page_size(self):
+        def count(size):
+            with self.settings(EVENT_LIST_PAGE_SIZE=size), CaptureQueriesContext(connection) as ctx:
+                self.client.get(reverse('event_list'))
+            return len(ctx.captured_queries)
+        # categories come with the events; cards don't load organizers one by one
+        self.assertEqual(count(2), count(9))
+
+    @override_settings(EVENT_LIST_PAGE_SIZE=2, EVENT_LIST_COUNT='exact')
+    def test_garbage_cursor_falls_back_to_first_page(self):
+        resp = self.client.get(reverse('event_list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([e.title for e in resp.context['events']], ['Event 0', 'Event 1'])
+        self.assertEqual(resp.context['events'].count, 9)
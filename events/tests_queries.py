@@ -0,0 +1,64 @@
+import json
+from collections import Counter
+from io import StringIO
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from auralink import instrumentation
+from .models import Event
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_avoid_full_scans(self):
+        out = StringIO()
+        # raises CommandError if an index needed by a view has gone missing
+        call_command('explain_queries', '--fail-on-scan', stdout=out)
+        self.assertIn('0 unexpected full scans', out.getvalue())
+
+
+@override_settings(MIDDLEWARE=['auralink.instrumentation.PerfMiddleware'] + settings.MIDDLEWARE)
+class PerfMiddlewareTests(TestCase):
+    def setUp(self):
+        instrumentation.store.clear()
+        self.staff = get_user_model().objects.create_user('staff1', 's1@example.com', 'pass', is_staff=True)
+        self.client.force_login(self.staff)
+        Event.objects.create(title='Gig', description='x', start_time=timezone.now(),
+                             end_time=timezone.now(), venue='Hall')
+
+    def test_records_per_view_samples(self):
+        for _ in range(3):
+            self.client.get(reverse('event_list'))
+        self.client.get(reverse('dashboard'))
+
+        report = instrumentation.store.report()
+        listing = report['event_list']
+        self.assertEqual(listing['requests'], 3)
+        self.assertGreater(listing['avg_queries'], 0)
+        self.assertGreater(listing['avg_template_ms'], 0)
+        self.assertIsNotNone(listing['latency_ms']['p99'])
+        self.assertEqual(report['dashboard']['requests'], 1)
+
+        request = RequestFactory().get('/_perf/')
+        request.user = self.staff
+        data = json.loads(instrumentation.perf_report(request).content)
+        self.assertIn('event_list', data)
+
+    def test_render_wrapped_once(self):
+        self.client.get(reverse('event_list'))
+        original = instrumentation._original_render
+        instrumentation.PerfMiddleware(lambda request: None)
+        self.assertIs(instrumentation._original_render, original)
+        self.assertIsNot(original, instrumentation._timed_render)
+
+    def test_repeated_queries_flagged(self):
+        counts = Counter({'SELECT 1 WHERE id = %s': 12, 'SELECT 2': 1})
+        self.assertEqual(instrumentation.repeated_queries(counts, 5), [('SELECT 1 WHERE id = %s', 12)])
+
+    def test_ring_buffer_is_bounded(self):
+        store = instrumentation.PerfStore(size=3)
+        for n in range(10):
+            store.record('v', n, instrumentation.RequestStats(), [])
+        self.assertEqual(store.report()['v']['requests'], 3)
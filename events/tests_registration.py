@@ -0,0 +1,162 @@
+import threading
+from django.test import TestCase, TransactionTestCase
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .forms import RegistrationForm
+from .models import Event, OutboundEmail, Registration
+from .registrations import AlreadyRegistered, register
+
+
+def make_event(**kwargs):
+    defaults = {
+        'title': 'Launch',
+        'description': 'x',
+        'start_time': timezone.now(),
+        'end_time': timezone.now(),
+        'venue': 'Hall',
+        'capacity': 2,
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(**defaults)
+
+
+def make_form(n):
+    return RegistrationForm({'full_name': f'Guest {n}', 'email': f'guest{n}@example.com', 'phone': ''})
+
+
+class CapacityTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def test_register_stops_at_capacity(self):
+        event = make_event(capacity=2)
+        for n in range(2):
+            form = make_form(n)
+            self.assertTrue(form.is_valid())
+            self.assertIsNotNone(register(event, form))
+        form = make_form(3)
+        form.is_valid()
+        self.assertIsNone(register(event, form))
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 2)
+        self.assertTrue(event.is_sold_out)
+        self.assertEqual(Registration.objects.count(), 2)
+
+    def test_zero_capacity_is_unlimited(self):
+        event = make_event(capacity=0)
+        for n in range(5):
+            form = make_form(n)
+            form.is_valid()
+            self.assertIsNotNone(register(event, form))
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 5)
+        self.assertIsNone(event.seats_left)
+
+    def test_sold_out_event_detail_and_checkout(self):
+        event = make_event(capacity=1, price=10)
+        Registration.objects.create(event=event, full_name='First', email='first@example.com')
+        data = {'full_name': 'Late', 'email': 'late@example.com', 'phone': ''}
+        for name in ('event_detail', 'checkout'):
+            resp = self.client.post(reverse(name, kwargs={'slug': event.slug}), data)
+            self.assertRedirects(resp, reverse('event_detail', kwargs={'slug': event.slug}))
+        self.assertEqual(Registration.objects.count(), 1)
+
+    def test_deleting_registration_frees_seat(self):
+        event = make_event(capacity=1)
+        reg = Registration.objects.create(event=event, full_name='First', email='first@example.com')
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 1)
+        reg.delete()
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 0)
+
+
+class DuplicateRegistrationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(self.user)
+        self.event = make_event(capacity=3)
+
+    def test_second_registration_for_same_email_is_rejected(self):
+        form = make_form(1)
+        form.is_valid()
+        register(self.event, form)
+        again = RegistrationForm({'full_name': 'Guest 1', 'email': 'GUEST1@example.com', 'phone': ''})
+        again.is_valid()
+        with self.assertRaises(AlreadyRegistered):
+            register(self.event, again)
+        self.event.refresh_from_db()
+        # the seat claimed by the failed attempt was rolled back
+        self.assertEqual(self.event.seats_taken, 1)
+        self.assertEqual(self.event.registrations.count(), 1)
+
+    def test_retry_after_last_seat_reports_already_registered(self):
+        event = make_event(title='Small launch', capacity=1)
+        form = make_form(1)
+        form.is_valid()
+        register(event, form)
+        with self.assertRaises(AlreadyRegistered):
+            register(event, form)
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        form = make_form(1)
+        form.is_valid()
+        form.instance.full_name = None
+        with self.assertRaises(IntegrityError):
+            register(self.event, form)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 0)
+
+    def test_form_validation_does_not_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(make_form(1).is_valid())
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_double_submit_is_idempotent(self):
+        data = {'full_name': 'Guest', 'email': 'guest@example.com', 'phone': ''}
+        detail = reverse('event_detail', kwargs={'slug': self.event.slug})
+        success = reverse('payment_success', kwargs={'slug': self.event.slug})
+        self.assertRedirects(self.client.post(detail, data), detail)
+        resp = self.client.post(detail, data, follow=True)
+        self.assertContains(resp, 'already registered')
+        self.assertRedirects(self.client.post(reverse('checkout', kwargs={'slug': self.event.slug}), data), success)
+        self.assertEqual(self.event.registrations.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    threads = 20
+
+    def test_concurrent_registrations_never_oversell(self):
+        event = make_event(capacity=5)
+        barrier = threading.Barrier(self.threads)
+        results = []
+        errors = []
+
+        def worker(n):
+            try:
+                form = make_form(n)
+                form.is_valid()
+                barrier.wait()
+                results.append(register(event, form))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(self.threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sum(r is not None for r in results), 5)
+        self.assertEqual(sum(r is None for r in results), self.threads - 5)
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 5)
+        self.assertEqual(Registration.objects.filter(event=event).count(), 5)
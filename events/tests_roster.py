@@ -0,0 +1,65 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from .models import Event, Registration
+from .roster import signup_stats
+
+
+@override_settings(REGISTRATION_TABLE_PAGE_SIZE=3)
+class RegistrationTableTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.organizer = User.objects.create_user('org', 'o@example.com', 'pass', is_staff=True)
+        self.client.force_login(self.organizer)
+        now = timezone.now()
+        self.event = Event.objects.create(title='Fest', description='x', start_time=now, end_time=now,
+                                          venue='Hall', capacity=20, organizer=self.organizer)
+        names = ['Mira', 'Arun', 'Zara', 'Bela', 'Omar', 'Kiran', 'Dev']
+        for n, name in enumerate(names):
+            reg = Registration.objects.create(event=self.event, full_name=name, email=f'{name.lower()}@example.com')
+            # spread signups over three days
+            Registration.objects.filter(pk=reg.pk).update(created_at=now - timedelta(days=n % 3, minutes=n))
+        self.json_url = reverse('event_registrations_json', args=[self.event.pk])
+
+    def walk(self, **params):
+        names, url = [], self.json_url
+        resp = self.client.get(url, params)
+        while True:
+            data = resp.json()
+            names += [r['full_name'] for r in data['results']]
+            if not data['next']:
+                return names
+            resp = self.client.get(url + data['next'])
+
+    def test_json_pages_cover_every_row_in_sort_order(self):
+        self.assertEqual(self.walk(sort='name'), ['Arun', 'Bela', 'Dev', 'Kiran', 'Mira', 'Omar', 'Zara'])
+        self.assertEqual(self.walk(sort='-name'), ['Zara', 'Omar', 'Mira', 'Kiran', 'Dev', 'Bela', 'Arun'])
+        by_date = list(self.event.registrations.order_by('-created_at', '-id').values_list('full_name', flat=True))
+        self.assertEqual(self.walk(), by_date)
+
+    def test_search_filters_name_and_email(self):
+        self.assertEqual(self.walk(q='AR', sort='name'), ['Arun', 'Omar', 'Zara'])
+
+    def test_page_renders_one_page_and_stats(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('organizer_event_detail', args=[self.event.pk]), {'sort': 'email'})
+        self.assertEqual([r.full_name for r in resp.context['registrations']], ['Arun', 'Bela', 'Dev'])
+        self.assertContains(resp, 'Load more')
+        self.assertContains(resp, '35.0% full')
+        # session, user, event, one page of rows, one histogram query; no per-row lookups
+        self.assertEqual(len(ctx.captured_queries), 5)
+
+    def test_signup_histogram(self):
+        self.event.refresh_from_db()
+        stats = signup_stats(self.event)
+        self.assertEqual(stats['total'], 7)
+        self.assertEqual([d['signups'] for d in stats['days']], [2, 2, 3])
+        self.assertEqual(stats['peak'], 3)
+
+    def test_other_users_are_refused(self):
+        self.client.force_login(get_user_model().objects.create_user('guest', 'g@example.com', 'pass'))
+        self.assertEqual(self.client.get(self.json_url).status_code, 302)
@@ -0,0 +1,55 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from auralink.db_router import PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware
+from .models import Event
+
+router = ReplicaRouter()
+
+
+def reading_view(request):
+    return HttpResponse(router.db_for_read(Event))
+
+
+def writing_view(request):
+    router.db_for_write(Event)
+    return HttpResponse(router.db_for_read(Event))
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def call(self, view, request):
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_get_reads_from_replica(self):
+        resp = self.call(reading_view, self.factory.get('/'))
+        self.assertEqual(resp.content, b'replica_1')
+        self.assertNotIn(PIN_COOKIE, resp.cookies)
+
+    def test_write_pins_request_and_sets_cookie(self):
+        resp = self.call(writing_view, self.factory.get('/'))
+        self.assertEqual(resp.content, b'default')
+        self.assertIn(PIN_COOKIE, resp.cookies)
+
+    def test_pin_cookie_keeps_next_request_on_primary(self):
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.call(reading_view, request).content, b'default')
+
+    def test_unsafe_methods_read_from_primary(self):
+        self.assertEqual(self.call(reading_view, self.factory.post('/')).content, b'default')
+
+    def test_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica_1', 'events'))
+        self.assertTrue(router.allow_migrate('default', 'events'))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_falls_back_to_primary_without_replicas(self):
+        resp = self.call(writing_view, self.factory.get('/'))
+        self.assertEqual(self.call(reading_view, self.factory.get('/')).content, b'default')
+        self.assertNotIn(PIN_COOKIE, resp.cookies)
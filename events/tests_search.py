@@ -0,0 +1,64 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .models import Event, Category
+from .search import search, search_terms
+
+
+def make_event(title, venue='Hall', description='x', **kwargs):
+    start = timezone.now() + timedelta(days=kwargs.pop('days', 1))
+    return Event.objects.create(title=title, venue=venue, description=description,
+                                start_time=start, end_time=start, **kwargs)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.music = Category.objects.create(name='Music')
+        self.jazz = make_event('Jazz Night', description='Live band', category=self.music)
+        self.talk = make_event('Startup Talk', description='Founders discuss jazz funding', days=2)
+        self.yoga = make_event('Morning Yoga', venue='Jazz Garden', days=3)
+
+    def _titles(self, query, qs=None):
+        qs, ordering = search(qs if qs is not None else Event.objects.all(), query)
+        return [e.title for e in qs.order_by(*ordering)]
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(self._titles('jazz'), ['Jazz Night', 'Morning Yoga', 'Startup Talk'])
+
+    def test_prefix_and_operator_safety(self):
+        self.assertEqual(self._titles('star'), ['Startup Talk'])
+        self.assertEqual(search_terms('"jazz" OR -(night'), ['jazz', 'or', 'night'])
+        self.assertEqual(self._titles('"yoga'), ['Morning Yoga'])
+
+    def test_index_follows_save_and_delete(self):
+        self.jazz.title = 'Blues Night'
+        self.jazz.save()
+        self.assertEqual(self._titles('blues'), ['Blues Night'])
+        self.jazz.delete()
+        self.assertEqual(self._titles('blues'), [])
+
+    def test_rebuild_command(self):
+        Event.objects.filter(pk=self.yoga.pk).update(title='Evening Pilates')  # skips signals
+        self.assertEqual(self._titles('pilates'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self._titles('pilates'), ['Evening Pilates'])
+
+    @override_settings(EVENT_LIST_PAGE_SIZE=1, EVENT_LIST_COUNT='exact')
+    def test_event_list_search_with_category_and_pages(self):
+        user = get_user_model().objects.create_user('attendee', 'a@example.com', 'pass')
+        self.client.force_login(user)
+        resp = self.client.get(reverse('event_list'), {'q': 'jazz', 'category': 'music'})
+        self.assertEqual([e.title for e in resp.context['events']], ['Jazz Night'])
+        self.assertIsNone(resp.context['next_url'])
+
+        resp = self.client.get(reverse('event_list'), {'q': 'jazz'})
+        self.assertEqual(resp.context['events'].count, 3)
+        seen = [e.title for e in resp.context['events']]
+        while resp.context['next_url']:
+            resp = self.client.get(reverse('event_list') + resp.context['next_url'])
+            seen += [e.title for e in resp.context['events']]
+        self.assertEqual(seen, ['Jazz Night', 'Morning Yoga', 'Startup Talk'])
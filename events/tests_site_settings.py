@@ -0,0 +1,18 @@
+from unittest import mock
+from django.test import TestCase
+from auralink import context_processors as cp
+
+
+class SiteSettingsTests(TestCase):
+    def test_assets_resolved_once_and_clearable(self):
+        cp.clear_site_assets()
+        with mock.patch.object(cp, '_static_exists', wraps=cp._static_exists) as exists:
+            first = cp.site_settings(None)
+            calls = exists.call_count
+            self.assertEqual(cp.site_settings(None), first)
+            self.assertEqual(exists.call_count, calls)
+
+            cp.clear_site_assets()
+            cp.site_settings(None)
+            self.assertGreater(exists.call_count, calls)
+        self.assertTrue(first['LOGO_URL'].startswith('/static/images/'))
@@ -0,0 +1,71 @@
+from unittest import mock
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+from . import slugs
+from .models import Category, Event
+
+
+def make_event(title, **kwargs):
+    now = timezone.now()
+    return Event.objects.create(title=title, description='x', start_time=now, end_time=now, venue='Hall', **kwargs)
+
+
+class SlugAllocationTests(TestCase):
+    def test_duplicate_titles_get_numbered_slugs(self):
+        slugs_made = [make_event('Tech Meetup').slug for _ in range(3)]
+        self.assertEqual(slugs_made, ['tech-meetup', 'tech-meetup-2', 'tech-meetup-3'])
+        self.assertEqual(Category.objects.create(name='Music').slug, 'music')
+        self.assertEqual(Category.objects.create(name='Music').slug, 'music-2')
+
+    def test_next_suffix_found_with_one_query(self):
+        for n in range(1, 20):
+            make_event('Meetup', slug=f'meetup-{n}')
+        make_event('Meetup London')
+        with self.assertNumQueries(1):
+            self.assertEqual(slugs.next_slug(Event, 'Meetup'), 'meetup-20')
+
+    def test_explicit_slug_is_kept(self):
+        self.assertEqual(make_event('Gig', slug='custom').slug, 'custom')
+        self.assertEqual(make_event('Custom').slug, 'custom-2')
+
+    def test_long_titles_leave_room_for_a_suffix(self):
+        title = 'word ' * 80
+        first, second = make_event(title), make_event(title)
+        self.assertLessEqual(len(second.slug), 255)
+        self.assertEqual(second.slug, f'{first.slug}-2')
+
+    def test_assign_slugs_for_bulk_create(self):
+        make_event('Jazz Night')
+        now = timezone.now()
+        batch = [Event(title=t, description='x', start_time=now, end_time=now, venue='Hall')
+                 for t in ('Jazz Night', 'Jazz Night', 'Poetry Slam', 'Open Mic')]
+        batch.append(Event(title='Open Mic', slug='open-mic', description='x', start_time=now, end_time=now, venue='Hall'))
+        with self.assertNumQueries(1):
+            slugs.assign_slugs(batch, 'title')
+        self.assertEqual([e.slug for e in batch], ['jazz-night-2', 'jazz-night-3', 'poetry-slam', 'open-mic-2', 'open-mic'])
+        Event.objects.bulk_create(batch)
+
+    def test_retries_when_a_concurrent_insert_takes_the_slug(self):
+        real_next_slug = slugs.next_slug
+        calls = []
+
+        def racing_next_slug(model, text, *args):
+            slug = real_next_slug(model, text, *args)
+            if not calls:
+                # another request inserts the same slug between our lookup and insert
+                make_event('Other', slug=slug)
+            calls.append(slug)
+            return slug
+
+        with mock.patch.object(slugs, 'next_slug', racing_next_slug):
+            ev = make_event('Launch Party')
+        self.assertEqual(calls, ['launch-party', 'launch-party-2'])
+        self.assertEqual(ev.slug, 'launch-party-2')
+        self.assertEqual(Event.objects.filter(slug__startswith='launch-party').count(), 2)
+
+    def test_other_integrity_errors_are_not_retried(self):
+        with mock.patch.object(slugs, 'next_slug', wraps=slugs.next_slug) as next_slug:
+            with self.assertRaises(IntegrityError):
+                make_event(None)
+        self.assertEqual(next_slug.call_count, 1)
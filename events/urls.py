@@ -9,6 +9,11 @@ urlpatterns = [
     path('events/<slug:slug>/checkout/', views.checkout, name='checkout'),
     path('events/<slug:slug>/success/', views.payment_success, name='payment_success'),
 
+    # calendar feeds
+    path('calendar/events.ics', views.calendar_feed, name='calendar_feed'),
+    path('calendar/categories/<slug:slug>.ics', views.category_calendar_feed, name='category_calendar_feed'),
+    path('calendar/organizers/<int:pk>.ics', views.organizer_calendar_feed, name='organizer_calendar_feed'),
+
     # auth
     path('accounts/signup/', views.signup, name='signup'),
     path('accounts/login/', auth_views.LoginView.as_view(template_name='registration/login.html'), name='login'),
@@ -20,4 +25,9 @@ urlpatterns = [
     path('dashboard/events/<int:pk>/', views.organizer_event_detail, name='organizer_event_detail'),
     path('dashboard/events/<int:pk>/edit/', views.edit_event, name='edit_event'),
     path('dashboard/events/<int:pk>/delete/', views.delete_event, name='delete_event'),
+    path('dashboard/events/<int:pk>/registrations/', views.event_registrations_json, name='event_registrations_json'),
+    path('dashboard/events/<int:pk>/registrations.<str:fmt>', views.export_event_registrations, name='export_event_registrations'),
+    path('dashboard/events/<int:pk>/import/', views.import_event_registrations, name='import_event_registrations'),
+    path('dashboard/registrations.<str:fmt>', views.export_my_registrations, name='export_my_registrations'),
+    path('dashboard/cache-stats/', views.cache_stats, name='cache_stats'),
 ]
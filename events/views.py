@@ -1,13 +1,26 @@
+import io
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
 from django.contrib import messages
 from django.contrib.auth import login as auth_login, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.forms import AuthenticationForm
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse, Http404
 from django.urls import reverse
-from .models import Event, Registration, Category
-from .forms import RegistrationForm, SignUpForm, EventForm
+from django.conf import settings
+from .models import Event, Registration
+from .forms import RegistrationForm, SignUpForm, EventForm, RegistrationImportForm
+from .dashboard import dashboard_data
+from .registrations import AlreadyRegistered, register
+from .outbox import enqueue
+from .pagination import paginate_keyset, approximate_count, InvalidCursor
+from .search import search
+from . import categories
+from .caching import featured_fragment, event_body_fragment, fragment_stats
+from .conditional import conditional_page, page_etag
+from .exports import export_response, CONTENT_TYPES
+from .imports import import_registrations
+from .roster import registration_page, signup_stats, as_json
+from .ical import feed_response, feed_subscriber, feed_token
 
 
 def home(request):
@@ -32,8 +45,10 @@ def home(request):
             messages.error(request, 'Login failed — check your username and password.')
 
 
-    featured = Event.objects.order_by('-start_time')[:6]
-    return render(request, 'events/home.html', {'featured': featured, 'login_form': login_form})
+    # lazy queryset: only evaluated when the cached fragment has to be re-rendered
+    featured = Event.objects.upcoming().order_by('start_time', 'id')[:6]
+    featured_html = featured_fragment(request.user, featured)
+    return render(request, 'events/home.html', {'featured_html': featured_html, 'login_form': login_form})
 
 
 def _can_manage_event(user, event=None):
@@ -84,26 +99,59 @@ def event_list(request):
 
     # Optional category filter via ?category=<slug>
     category_slug = request.GET.get('category')
-    categories = Category.objects.order_by('name')
-    qs = Event.objects.order_by('start_time')
+    # upcoming events soonest first by default; ?when=past lists finished ones, newest first
+    when = 'past' if request.GET.get('when') == 'past' else 'upcoming'
+    listed = Event.objects.select_related('category')
+    if when == 'past':
+        qs, ordering = listed.past(), ('-start_time', '-id')
+    else:
+        qs, ordering = listed.upcoming(), ('start_time', 'id')
     selected_category = None
     if category_slug:
-        selected_category = get_object_or_404(Category, slug=category_slug)
-        qs = qs.filter(category=selected_category)
+        # from the in-process category registry, no query
+        selected_category = categories.by_slug(category_slug)
+        if selected_category is None:
+            raise Http404('No such category')
+        qs = qs.filter(category_id=selected_category.id)
+
+    # Optional full-text search via ?q=, ranked best match first
+    query = request.GET.get('q', '').strip()
+    if query:
+        qs, ordering = search(qs, query, ordering)
+
+    # keyset pagination: no OFFSET scans, no COUNT(*) per request
+    try:
+        events = paginate_keyset(qs, request.GET.get('cursor'), settings.EVENT_LIST_PAGE_SIZE, ordering)
+    except InvalidCursor:
+        events = paginate_keyset(qs, None, settings.EVENT_LIST_PAGE_SIZE, ordering)
+    if settings.EVENT_LIST_COUNT == 'exact':
+        events.count = qs.count()
+    elif settings.EVENT_LIST_COUNT == 'approximate':
+        events.count = approximate_count(qs)
 
-    paginator = Paginator(qs, 6)
-    page = request.GET.get('page')
-    events = paginator.get_page(page)
     context = {
         'events': events,
-        'categories': categories,
+        'categories': categories.all_categories(),
         'selected_category': selected_category,
+        'query': query,
+        'when': when,
+        'next_url': _page_url(request, events.next_cursor),
+        'previous_url': _page_url(request, events.previous_cursor),
+        'feed_token': feed_token(request.user),
     }
-    return render(request, 'events/event_list.html', context)
+    etag = page_etag(request, request.get_full_path(), context['categories'], events.count,
+                     [(ev.pk, ev.updated_at, ev.category_id) for ev in events])
+    last_modified = max((ev.updated_at for ev in events), default=None)
+    return conditional_page(request, etag, last_modified, lambda: render(request, 'events/event_list.html', context))
 
 
-from django.core.mail import send_mail
-from django.conf import settings
+def _page_url(request, cursor):
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params.pop('page', None)
+    params['cursor'] = cursor
+    return f'?{params.urlencode()}'
 
 
 def event_detail(request, slug):
@@ -119,26 +167,32 @@ def event_detail(request, slug):
 
         form = RegistrationForm(request.POST)
         if form.is_valid():
-            reg = form.save(commit=False)
-            reg.event = event
-            reg.save()
-            # send confirmation email (console backend in dev)
             try:
-                send_mail(
-                    subject=f"Registration confirmed for {event.title}",
-                    message=f"Thanks {reg.full_name} for registering for {event.title}.",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[reg.email],
-                    fail_silently=True,
-                )
-            except Exception:
-                pass
+                reg = register(event, form)
+            except AlreadyRegistered:
+                messages.info(request, 'You are already registered for this event.')
+                return redirect('event_detail', slug=event.slug)
+            if reg is None:
+                messages.error(request, 'Sorry, this event is sold out.')
+                return redirect('event_detail', slug=event.slug)
+            # queue the confirmation email; send_queued_mail delivers it
+            enqueue(
+                subject=f"Registration confirmed for {event.title}",
+                message=f"Thanks {reg.full_name} for registering for {event.title}.",
+                recipient_list=[reg.email],
+            )
 
             messages.success(request, 'Registration Successful')
             return redirect('event_detail', slug=event.slug)
     else:
         form = RegistrationForm()
-    return render(request, 'events/event_detail.html', {'event': event, 'form': form})
+    # seats_taken moves without touching updated_at; POSTs with form errors are always rendered
+    etag = page_etag(request, event.pk, event.updated_at, event.seats_taken)
+    return conditional_page(request, etag, event.updated_at, lambda: render(request, 'events/event_detail.html', {
+        'event': event,
+        'event_body': event_body_fragment(event),
+        'form': form,
+    }))
 
 
 def checkout(request, slug):
@@ -156,16 +210,20 @@ def checkout(request, slug):
         # For this demo we treat this as a successful payment and create the registration
         form = RegistrationForm(request.POST)
         if form.is_valid():
-            reg = form.save(commit=False)
-            reg.event = event
-            reg.save()
-            # send confirmation
-            send_mail(
+            try:
+                reg = register(event, form)
+            except AlreadyRegistered:
+                # a double-click or retry of a checkout that already went through
+                messages.info(request, 'You are already registered for this event.')
+                return redirect('payment_success', slug=event.slug)
+            if reg is None:
+                messages.error(request, 'Sorry, this event is sold out.')
+                return redirect('event_detail', slug=event.slug)
+            # queue the confirmation email
+            enqueue(
                 subject=f"Payment & Registration confirmed for {event.title}",
                 message=f"Thanks {reg.full_name} — your payment for {event.title} was received (demo).",
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[reg.email],
-                fail_silently=True,
             )
             return redirect('payment_success', slug=event.slug)
     else:
@@ -175,7 +233,42 @@ def checkout(request, slug):
 
 def payment_success(request, slug):
     event = get_object_or_404(Event, slug=slug)
-    return render(request, 'events/payment_success.html', {'event': event})
+    etag = page_etag(request, event.pk, event.updated_at)
+    return conditional_page(request, etag, event.updated_at,
+                            lambda: render(request, 'events/payment_success.html', {'event': event}))
+
+
+def _require_feed_token(request):
+    # calendar apps cannot log in; the URL's token stands in for the session
+    subscriber = feed_subscriber(request)
+    if subscriber is None:
+        raise Http404('No such feed')
+    return subscriber
+
+
+def calendar_feed(request):
+    _require_feed_token(request)
+    return feed_response(request, Event.objects.all(), settings.SITE_NAME, 'events')
+
+
+def category_calendar_feed(request, slug):
+    _require_feed_token(request)
+    category = categories.by_slug(slug)
+    if category is None:
+        raise Http404('No such category')
+    return feed_response(request, Event.objects.filter(category_id=category.id),
+                         f'{settings.SITE_NAME}: {category.name}', f'events-{category.slug}')
+
+
+def organizer_calendar_feed(request, pk):
+    # an organizer's own feed only, so ids cannot be probed for organizers
+    if _require_feed_token(request) != pk:
+        raise Http404('No such organizer')
+    # it never names the account
+    events = Event.objects.filter(organizer_id=pk)
+    if not events.exists():
+        raise Http404('No such organizer')
+    return feed_response(request, events, f'{settings.SITE_NAME}: Organizer {pk}', f'events-organizer-{pk}')
 
 
 def signup(request):
@@ -201,34 +294,8 @@ def is_organizer(user):
 def dashboard(request):
     if not is_organizer(request.user):
         return redirect('event_list')
-
-    if request.user.is_superuser:
-        events = Event.objects.order_by('-start_time')
-        regs = Registration.objects.order_by('-created_at')[:10]
-        stats = {
-            'total_events': events.count(),
-            'total_registrations': Registration.objects.count(),
-        }
-    else:
-        events = Event.objects.filter(organizer=request.user).order_by('-start_time')
-        regs = Registration.objects.filter(event__organizer=request.user).order_by('-created_at')[:10]
-        stats = {
-            'total_events': events.count(),
-            'total_registrations': Registration.objects.filter(event__organizer=request.user).count(),
-        }
-
-    categorized_events = []
-    categories = Category.objects.order_by('name')
-    for cat in categories:
-        cat_events = events.filter(category=cat)
-        if cat_events.exists():
-            categorized_events.append((cat, cat_events))
-
-    uncategorized = events.filter(category__isnull=True)
-    if uncategorized.exists():
-        categorized_events.append((None, uncategorized))
-
-    return render(request, 'events/dashboard.html', {'events': events, 'categorized_events': categorized_events, 'registrations': regs, 'stats': stats})
+    return render(request, 'events/dashboard.html',
+                  {**dashboard_data(request.user), 'feed_token': feed_token(request.user)})
 
 
 @login_required
@@ -253,5 +320,85 @@ def organizer_event_detail(request, pk):
     ev = get_object_or_404(Event, pk=pk)
     if not _can_manage_event(request.user, ev):
         return HttpResponseForbidden()
-    regs = ev.registrations.all()
-    return render(request, 'events/organizer_event_detail.html', {'event': ev, 'registrations': regs})
+    # one page of the table at a time; further pages load from event_registrations_json
+    page, sort, query = registration_page(ev, request.GET, settings.REGISTRATION_TABLE_PAGE_SIZE)
+    return render(request, 'events/organizer_event_detail.html', {
+        'event': ev,
+        'registrations': page,
+        'sort': sort,
+        'query': query,
+        'stats': signup_stats(ev),
+        'next_url': _page_url(request, page.next_cursor),
+        'previous_url': _page_url(request, page.previous_cursor),
+    })
+
+
+@login_required
+@user_passes_test(is_organizer)
+def event_registrations_json(request, pk):
+    """The organizer registration table as JSON, page by page (same sort/q/cursor params)."""
+    ev = get_object_or_404(Event, pk=pk)
+    if not _can_manage_event(request.user, ev):
+        return HttpResponseForbidden()
+    page, sort, query = registration_page(ev, request.GET, settings.REGISTRATION_TABLE_PAGE_SIZE)
+    return JsonResponse({
+        'results': [as_json(reg) for reg in page],
+        'next': _page_url(request, page.next_cursor),
+        'previous': _page_url(request, page.previous_cursor),
+    })
+
+
+@login_required
+@user_passes_test(is_organizer)
+def cache_stats(request):
+    """Fragment cache hit/miss counters for this worker process."""
+    return JsonResponse(fragment_stats())
+
+
+@login_required
+@user_passes_test(is_organizer)
+def export_event_registrations(request, pk, fmt):
+    ev = get_object_or_404(Event, pk=pk)
+    if not _can_manage_event(request.user, ev):
+        return HttpResponseForbidden()
+    if fmt not in CONTENT_TYPES:
+        raise Http404
+    return export_response(ev.registrations.all(), fmt, f'{ev.slug}-registrations')
+
+
+@login_required
+@user_passes_test(is_organizer)
+def export_my_registrations(request, fmt):
+    if fmt not in CONTENT_TYPES:
+        raise Http404
+    regs = Registration.objects.all()
+    if not request.user.is_superuser:
+        regs = regs.filter(event__organizer=request.user)
+    return export_response(regs, fmt, f'{request.user.username}-registrations')
+
+
+@login_required
+@user_passes_test(is_organizer)
+def import_event_registrations(request, pk):
+    ev = get_object_or_404(Event, pk=pk)
+    if not _can_manage_event(request.user, ev):
+        return HttpResponseForbidden()
+    result = None
+    if request.method == 'POST':
+        form = RegistrationImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data['file'], encoding='utf-8-sig', newline='')
+            try:
+                result = import_registrations(ev, lines)
+            except (ValueError, UnicodeDecodeError) as exc:
+                form.add_error('file', str(exc))
+            else:
+                messages.success(request, f'Imported {result.created} registrations; {len(result.rejected)} rows rejected.')
+    else:
+        form = RegistrationImportForm()
+    return render(request, 'events/import_registrations.html', {
+        'event': ev,
+        'form': form,
+        'result': result,
+        'rejected': result.rejected[:200] if result else [],
+    })
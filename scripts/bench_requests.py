@@ -0,0 +1,79 @@
+"""Measure requests/sec and latency of a running AuraLink server.
+
+Compare database settings by starting the server twice, e.g.
+
+    DB_CONN_MAX_AGE=0 python manage.py runserver --noreload
+    python scripts/bench_requests.py http://127.0.0.1:8000/events/ -n 2000 -c 8
+
+    DB_CONN_MAX_AGE=60 python manage.py runserver --noreload
+    python scripts/bench_requests.py http://127.0.0.1:8000/events/ -n 2000 -c 8
+
+Only the standard library is used, so it runs from any Python 3.
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def worker(url, count, headers, latencies, errors, lock):
+    for _ in range(count):
+        request = urllib.request.Request(url, headers=headers)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            with lock:
+                errors.append(1)
+            continue
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('url')
+    parser.add_argument('-n', '--requests', type=int, default=1000, help='Total requests to send')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='Parallel clients')
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests sent first')
+    parser.add_argument('--cookie', default='', help='Cookie header, e.g. "sessionid=..." for logged-in pages')
+    args = parser.parse_args(argv)
+
+    headers = {'Cookie': args.cookie} if args.cookie else {}
+    lock = threading.Lock()
+    worker(args.url, args.warmup, headers, [], [], lock)
+
+    latencies, errors = [], []
+    per_client = max(1, args.requests // args.concurrency)
+    threads = [threading.Thread(target=worker, args=(args.url, per_client, headers, latencies, errors, lock))
+               for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    if not latencies:
+        print(f'All {len(errors)} requests failed', file=sys.stderr)
+        return 1
+    latencies.sort()
+    ms = [v * 1000 for v in latencies]
+    print(f'{len(latencies)} requests, {len(errors)} errors, {args.concurrency} clients in {wall:.2f}s')
+    print(f'{len(latencies) / wall:.1f} requests/sec')
+    print(f'latency ms: mean {statistics.mean(ms):.1f}  p50 {percentile(ms, 50):.1f}  '
+          f'p95 {percentile(ms, 95):.1f}  max {ms[-1]:.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
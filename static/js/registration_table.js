@@ -0,0 +1,40 @@
+// Organizer registration table: "Load more" appends the next page from the
+// JSON endpoint instead of reloading; without JavaScript it is a plain link.
+document.addEventListener('DOMContentLoaded', function () {
+  var link = document.getElementById('load-more-registrations');
+  if (!link) return;
+  var rows = document.getElementById('registration-rows');
+  var previous = document.getElementById('previous-registrations');
+
+  link.addEventListener('click', function (event) {
+    event.preventDefault();
+    if (link.classList.contains('disabled')) return;
+    link.classList.add('disabled');
+    fetch(link.dataset.jsonUrl + link.getAttribute('href'), {credentials: 'same-origin'})
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        data.results.forEach(function (reg) {
+          var tr = document.createElement('tr');
+          // created_at is local ISO time; show it like the server-rendered rows
+          [reg.full_name, reg.email, reg.phone, reg.created_at.slice(0, 16).replace('T', ' ')].forEach(function (text) {
+            var td = document.createElement('td');
+            td.textContent = text;
+            tr.appendChild(td);
+          });
+          rows.appendChild(tr);
+        });
+        // the table now spans several pages, so "Previous" no longer means the page before it
+        if (previous) {
+          previous.parentNode.remove();
+          previous = null;
+        }
+        if (data.next) {
+          link.setAttribute('href', data.next);
+          link.classList.remove('disabled');
+        } else {
+          link.parentNode.remove();
+        }
+      })
+      .catch(function () { window.location = link.getAttribute('href'); });
+  });
+});